@@ -15,3 +15,4 @@ from .type import *
 from .property import *
 from .entity import *
 from .stdtypes import *
+from .stream import *
@@ -6,6 +6,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import datetime
+import importlib
 import sys
 
 PY2 = sys.version_info[0] == 2
@@ -95,6 +96,12 @@ except ImportError:
 
     timezone.utc = timezone(datetime.timedelta(0))
 
+try:
+    # noinspection PyUnresolvedReferences
+    from collections.abc import MutableMapping, Sequence
+except ImportError:
+    from collections import MutableMapping, Sequence
+
 try:
     # noinspection PyUnresolvedReferences
     import ipaddress
@@ -107,6 +114,19 @@ except ImportError:
 
     ipaddress = _ipaddress()
 
+
+class _lazy_module(object):
+    # import 비용이 큰 선택적 의존성은 처음 사용할 때 import 한다.
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, item):
+        return getattr(importlib.import_module(self._name), item)
+
+
+numpy = _lazy_module('numpy')
+futures = _lazy_module('concurrent.futures')
+
 __all__ = [
     'MAX_SAFE_INTEGER',
     'PY2',
@@ -122,5 +142,9 @@ __all__ = [
     'make_key',
     'parsedate_to_datetime',
     'timezone',
+    'MutableMapping',
+    'Sequence',
     'ipaddress',
+    'numpy',
+    'futures',
 ]
@@ -4,11 +4,16 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
-import json
+import array
+import datetime
+import decimal
+import uuid
+import weakref
 from collections import OrderedDict
 
 from .compat import *
-from .property import Null, Property, Context, Marker, Proxy
+from .property import Null, _Null, Property, Context, Marker, Proxy, Tuple, _LazyTuple, _call_without_context, \
+    _json_encode, _json_quote, _lazy_context, _schema_lock, _drive, _Result, _Cooperative
 from .type import TypeMeta
 
 
@@ -134,6 +139,7 @@ class Selector(Property):
 
 
 class Composite(Property):
+    __slots__ = ()
     _cs_fields_ = {}  # {key: property}
     _cs_kind_key_ = None
     _cs_kind_ns_ = None  # {kind: entity-class}
@@ -241,15 +247,13 @@ class Composite(Property):
     #
 
     def __setattr__(self, name, value):
-        if hasattr(self.__class__, name):
-            if name in self._cs_fields_:
-                self._cs_fields_[name].__set__(self, value)
-            else:
-                self.__dict__[name] = value
-        elif self._ts_opts_.freeze:
+        fields = self._cs_fields_
+        if name in fields:
+            fields[name].__set__(self, value)
+        elif self._ts_opts_.freeze and not hasattr(self.__class__, name):
             raise AttributeError(name)
         else:
-            self.__dict__[name] = value
+            object.__setattr__(self, name, value)
 
     #
     # validation
@@ -318,6 +322,50 @@ class Composite(Property):
             value = Null
         return super(Composite, self).dump(self if value is Null else value, context)
 
+    def dumps(self, value=Null, context=None):
+        """
+        :py:class:`Entity` 를 JSON 텍스트로 변환한다.
+
+        ``json.dumps(entity.dump(context))`` 와 같은 결과를 주지만, 중간 단계의 :py:class:`dict` 들을 만들지 않고 JSON 조각들을 바로 기록한다.
+        ``view`` 와 ``only``, ``ordered``, 코덱이 모두 :py:meth:`Entity.dump` 와 같게 적용되고, 에러 정보도 같게 제공된다.
+
+        Since version 1.1.
+        """
+        if context is None and isinstance(value, Context):
+            context = value
+            value = Null
+        if value is Null:
+            value = self
+        if value is None:
+            return u'null'
+        if context is None:
+            return _call_without_context(self._dumps_, value)
+        return self._dumps_(value, context._local_())
+
+    def adump(self, value=Null, context=None, budget_ms=5):
+        """
+        :py:meth:`Entity.dump` 와 같은 일을 하는 awaitable 을 돌려준다.
+
+        이벤트 루프에 양보하는 방식은 :py:meth:`Property.aload` 와 같다.
+
+        Since version 1.1.
+        """
+        if context is None and isinstance(value, Context):
+            context = value
+            value = Null
+        return super(Composite, self).adump(self if value is Null else value, context, budget_ms)
+
+    def _dumps_(self, value, context):
+        if context._optimistic_ and not (context._explicit_ and self._pm_opts_.codec is not None):
+            if self._dumper_(value, '_es_writer_'):
+                return context._speculate_(value, self._write_, self._dumps_)
+        return _json_encode(self.dump(value, context))
+
+    def _write_(self, value, context):
+        parts = []
+        _write_entity(self, value, context, parts)
+        return u''.join(parts)
+
     #
     # equality
     #
@@ -330,7 +378,7 @@ class Composite(Property):
     #
 
     def __unicode__(self):
-        return json.dumps(self.dump(), ensure_ascii=False, separators=(',', ':'))
+        return self.dumps()
 
     def __bytes__(self):
         return self.__unicode__().encode('utf-8')
@@ -413,6 +461,20 @@ class Entity(Composite):
     클래스 옵션은 ``Meta`` 이름의 내부 클래스를 사용해서 제공한다. 옵션을 클래스 어트리뷰트로 제공하면 된다.
     ``Meta`` 로 지정되는 옵션들은 계승되지 않는다. 다음과 같은 클래스 옵션들을 제공한다.
 
+    slots
+        True 면 인스턴스가 ``__dict__`` 없이 ``__slots__`` 에 :py:class:`Property` 의 정의 순서대로 값을 저장한다.
+        인스턴스가 차지하는 메모리가 줄어든다. 많은 수의 인스턴스를 메모리에 유지할 때 사용한다.
+
+        :py:class:`dict` 인터페이스는 그대로 제공된다. 다만 :py:meth:`Entity.keys` 등의 순서는 값을 넣은 순서가 아니라 정의 순서를 따른다.
+        ``__dict__`` 가 없기 때문에 :py:class:`Property` 로 정의되지 않은 어트리뷰트를 인스턴스에 추가할 수 없다.
+
+        다른 클래스 옵션들과는 달리 자식 클래스들에도 적용된다.
+
+            .. literalinclude:: /../tests/ex/entity_slots.rst
+
+        기본 값은 False 다.
+
+        Since version 1.1.
     freeze
         False 면 :py:class:`Entity` 인스턴스에 :py:func:`setattr` 할 경우,
         :py:class:`Property` 로 정의되지 않은 어트리뷰트에 대해서는 관여하지 않는다.
@@ -424,6 +486,24 @@ class Entity(Composite):
             .. literalinclude:: /../tests/ex/entity_freeze.rst
 
         기본 값은 False 다.
+    cache
+        True 면 인스턴스가 :py:meth:`Entity.dumps` 로 만든 JSON 조각을 보관했다가, 값이 바뀌기 전까지 재사용한다.
+        이 인스턴스를 값으로 갖는 다른 :py:class:`Entity` 를 :py:meth:`Entity.dumps` 할 때도 보관한 조각을 그대로 끼워 넣는다.
+        자주 읽고 드물게 고치는 인스턴스들을 반복해서 serialize 할 때 사용한다.
+
+        조각은 ``only`` 옵션, :py:class:`Context` 의 ``view`` 와 전역 :py:class:`Codec` 설정별로 따로 보관된다.
+        Context-local :py:class:`Codec` 이 등록된 :py:class:`Context` 를 사용하면 캐시하지 않는다.
+        :py:class:`Entity` 를 고치는 모든 방법은 자신과 자신을 값으로 갖는 ``cache`` :py:class:`Entity` 들의 조각을 버린다.
+        ``cache`` 를 사용하지 않는 :py:class:`Entity` 나 :py:class:`JsonObject` 처럼 제자리에서 고칠 수 있는 값을 포함하면 캐시하지 않는다.
+        :py:meth:`Entity.dump` 가 돌려주는 :py:class:`dict` 는 캐시하지 않는다.
+
+        ``slots`` 와 함께 사용할 수 없다.
+
+            .. literalinclude:: /../tests/ex/entity_cache.rst
+
+        기본 값은 False 다.
+
+        Since version 1.1.
 
     Example:
 
@@ -431,8 +511,15 @@ class Entity(Composite):
 
     Since version 1.0.
     """
+    __slots__ = ('_em_data_',)  # {name: property-value}
+    _ps_accepts_ = (dict, Composite)  # Composite 는 load 할 필요가 없는 인스턴스
     _es_names_ = None  # {property._pm_opts_.name : key}
-    _em_data_ = None  # {name: property-value}
+    _es_index_ = None  # {key: index}, slots 옵션이 사용된 경우 _em_values_ 에서의 위치
+    _es_data_ = dict  # _em_data_ 의 타입, cache 옵션이 사용된 경우 _CachedData
+
+    class MetaOptions(Composite.MetaOptions):
+        slots = False
+        cache = False
 
     class Options(Property.Options):
         only = None
@@ -446,7 +533,10 @@ class Entity(Composite):
         if len(args) > 1:
             raise TypeError('Entity expected at most 1 arguments, got %d' % len(args))
         super(Entity, self).__init__(**kwargs)
-        self._em_data_ = {}
+        if self._es_index_ is None:
+            self._em_data_ = self._es_data_()
+        else:
+            self._em_values_ = [None] * len(self._es_index_)
         self.update(*args)
 
     def __repr__(self, args=None, opts=None):
@@ -463,10 +553,41 @@ class Entity(Composite):
         instance._em_data_.update(self._em_data_)
         return instance
 
+    def __reduce__(self):
+        # 클래스와 정의 순서대로 나열한 값들로 pickle 한다. unpickle 할 때 __init__ 와 load 를 거치지 않는다.
+        return _reduce_entity(self, self.__class__)
+
+    @staticmethod
+    def _new_(name, bases, attrs):
+        meta = attrs.get(Entity.MetaOptions._metaoptions)
+        inherited = any(getattr(base, '_es_index_', None) is not None for base in bases)
+        if '__slots__' in attrs or not (inherited or getattr(meta, 'slots', False)):
+            return attrs
+        attrs = dict(attrs)
+        if inherited:
+            attrs['__slots__'] = ()
+        else:
+            attrs['__slots__'] = ('_em_values_',)
+            attrs['_em_data_'] = _SlotsDataDescriptor()
+            for key, func in _slots_methods.items():
+                attrs.setdefault(key, func)
+        attrs['_es_index_'] = {}  # _init_ 에서 채운다.
+        return attrs
+
     @staticmethod
     def _init_(cls, attrs, options):
         Composite._init_(cls, attrs, options)
 
+        if cls._es_index_ is not None:
+            cls._es_index_ = _storage_index(cls)
+
+        if options.cache:
+            if cls._es_index_ is not None:
+                raise TypeError('cache option cannot be used with slots')
+            cls._es_data_ = _CachedData
+        else:
+            cls._es_data_ = dict
+
         # TODO: optimize
         names = {}
         fields = cls._cs_fields_
@@ -479,6 +600,35 @@ class Entity(Composite):
 
         cls._es_names_ = names
 
+    #
+    # code generation
+    #
+
+    @classmethod
+    def compile(cls):
+        """
+        :py:meth:`Entity.load` 와 :py:meth:`Entity.dump` 에 사용될 코드를 생성한다.
+
+        :py:class:`Entity` 클래스의 정의에 특화된 파이썬 코드를 생성해서 일반적인 구현 대신 사용한다.
+        결과는 일반적인 구현과 같다. 생성된 코드가 실패하면 일반적인 구현으로 다시 실행하기 때문에
+        :py:attr:`Context.errors` 역시 같게 유지된다.
+
+        클래스가 처음 :py:meth:`Entity.load` 나 :py:meth:`Entity.dump` 될 때 자동으로 호출되기 때문에 직접 호출할 필요는 없다.
+        첫 호출의 지연을 피하고 싶을 때 미리 호출할 수 있다. 다형성을 갖는 경우 자식 클래스들도 함께 처리한다.
+
+        :py:func:`declare` 로 선언된 클래스가 아직 정의되지 않았으면 다음 기회로 미룬다.
+
+        코드 생성과 :py:func:`declare` 의 해석은 잠금으로 보호되기 때문에 여러 스레드에서 처음 사용되어도 한 번만 일어난다.
+        멀티스레드 서버에서는 시작할 때 사용할 클래스들에 대해 호출해두면 요청 처리 중에 잠금을 기다리는 일이 없다.
+
+        Since version 1.1.
+        """
+        classes = [cls]
+        if cls._cs_kind_ns_:
+            classes.extend(klass for klass in cls._cs_kind_ns_.values() if issubclass(klass, cls))
+        for klass in classes:
+            _compile(klass)
+
     #
     # property protocol
     #
@@ -574,17 +724,21 @@ class Entity(Composite):
                             value.validate(marker.context)
                 super(Entity, node).validate(marker.context)
 
-        validate(self, context)
+        validate(self, None if context is None else context._local_())
 
     #
     # serialization
     #
 
     def _prepare_dump_(self, value, context):
+        return _drive(self._prepare_dump_steps_(value, context), True)
+
+    def _prepare_dump_steps_(self, value, context):
         with Marker(context, value) as marker:
             dumps = []
-            for key in value._cs_fields_:
-                if self.is_visible(key, marker.context, value):
+            plan = _view_plan(self, type(value), marker.context)
+            for key in value._cs_fields_ if plan is None else plan.keys:
+                if plan is not None or self.is_visible(key, marker.context, value):
                     val = value._get_(key)
                     if val is not None:
                         with marker.cursor(key, val):
@@ -594,18 +748,78 @@ class Entity(Composite):
                                 val = None
                             elif key != value._cs_kind_key_:
                                 if isinstance(property, Selector):
-                                    val = property.select(self).dump(val, marker.context)
+                                    val = yield (property.select(self), val, marker.context)
                                 else:
-                                    val = property.dump(val, marker.context)
+                                    val = yield (property, val, marker.context)
                             dumps.append((key, property, name, val))
-            return dumps
+        yield _Result(dumps)
+
+    def _dumper_(self, value, attr='_es_dumper_'):
+        cls = self.__class__
+        klass = value.__class__
+        if attr not in klass.__dict__:
+            _compile(klass)
+        if cls is not klass:
+            if attr not in cls.__dict__:
+                _compile(cls)
+            if not cls.__dict__.get(attr):
+                return None
+        return klass.__dict__.get(attr)
 
     def _dump_(self, value, context):
+        if context is None:
+            return _call_without_context(self._dump_, value)
+        if context._optimistic_:
+            dumper = self._dumper_(value)
+            if dumper:
+                return context._speculate_(value, dumper.__get__(self), self._dump_)
         encoded = type(value._cs_fields_)()
         for key, property, name, val in self._prepare_dump_(value, context):
             encoded[name] = val
         return encoded
 
+    def _dump_steps_(self, value, context):
+        if _overrides(type(self), Entity, '_prepare_dump_'):
+            dumps = self._prepare_dump_(value, context)
+        else:
+            dumps = yield self._prepare_dump_steps_(value, context)
+        encoded = type(value._cs_fields_)()
+        for key, property, name, val in dumps:
+            encoded[name] = val
+        yield _Result(encoded)
+
+    def _new_value_(self, klass):
+        # self 가 읽어들인 값을 담을 klass 의 인스턴스를 만든다.
+        # Options 는 고쳐지지 않으므로 (apply_options 는 새 Options 를 만든다) 같은 Options 클래스를 쓰는 인스턴스들은 self 의 것을 공유한다.
+        opts = self._pm_opts_
+        if klass.__init__ != Entity.__init__ or type(opts) is not getattr(klass, klass.MetaOptions._options):
+            return klass(**opts.__dict__)
+        instance = object.__new__(klass)
+        object.__setattr__(instance, '_pm_opts_', opts)
+        if klass._es_index_ is None:
+            object.__setattr__(instance, '_em_data_', klass._es_data_())
+        else:
+            object.__setattr__(instance, '_em_values_', [None] * len(klass._es_index_))
+        return instance
+
+    def _defer_(self, key, property, value, context):
+        # Context 의 lazy 옵션을 지원한다. value 의 load 를 처음 읽을 때로 미룬다.
+        data = self._em_data_
+        if type(data) is not _LazyData:
+            data = _LazyData(data, _lazy_context(context))
+            object.__setattr__(self, '_em_data_', data)
+        data._data[key] = _Deferred(property, value)
+
+    def _load_batch_(self, value=None):
+        # Tuple 의 batch 옵션을 지원한다. value 가 None 이면 빈 EntityBatch 를 만든다.
+        if value is not None:
+            if isinstance(value, EntityBatch) and value._class is self.__class__:
+                return value
+            raise ValueError()
+        batch = EntityBatch(self.__class__)
+        batch._opts = self._pm_opts_
+        return batch
+
     def _prepare_load(self, value, context):
         if self._cs_kind_key_ is None:
             klass = self.__class__
@@ -614,7 +828,10 @@ class Entity(Composite):
             klass = self._cs_kind_ns_.get(value.get(kind_name))
             if klass is None or not issubclass(klass, self.__class__):
                 raise ValueError()
-        instance = klass(**self._pm_opts_.__dict__)
+        instance = self._new_value_(klass)
+        plan = _view_plan(self, type(instance), context)
+        if plan is not None:
+            return instance, plan.fields
         fields = {}
         for key in instance._cs_fields_:
             if self.is_visible(key, context, instance):
@@ -623,19 +840,53 @@ class Entity(Composite):
                 fields[name] = (key, property)
         return instance, fields
 
-    def _load_(self, value, context):
+    def _loader_(self, value):
+        if _overrides(self.__class__, Entity, 'is_visible'):
+            # 생성된 loader 는 load 하는 쪽의 is_visible 을 호출하지 않는다.
+            return None
+        if self._cs_kind_key_ is None:
+            klass = self.__class__
+        else:
+            kind_name = self._cs_fields_[self._cs_kind_key_]._pm_opts_.get('name', self._cs_kind_key_)
+            klass = self._cs_kind_ns_.get(value.get(kind_name))
+            if klass is None or not issubclass(klass, self.__class__):
+                return None
+        if '_es_loader_' not in klass.__dict__:
+            _compile(klass)
+        return klass.__dict__.get('_es_loader_')
+
+    def _isloaded(self, value):
+        # load 할 필요가 없는 값이면 True.
         if self._cs_kind_key_ is None:
             if type(value) is self.__class__:
-                return value
+                return True
+            if isinstance(value, _BatchRow) and value._eb_batch_._class is self.__class__:
+                return True
         else:
             if isinstance(value, self.__class__) and getattr(value, self._cs_kind_key_) is not None:
-                return value
+                return True
+        return False
 
+    def _load_(self, value, context):
+        if self._isloaded(value):
+            return value
+        if context._optimistic_ and isinstance(value, dict):
+            loader = self._loader_(value)
+            if loader:
+                return context._speculate_(value, loader.__get__(self), self._load_)
+        return _drive(self._load_steps_(value, context))
+
+    def _load_steps_(self, value, context):
+        if self._isloaded(value):
+            yield _Result(value)
+            return
         with Marker(context, value) as marker:
             if not isinstance(value, dict):
                 raise ValueError()
 
             instance, fields = self._prepare_load(value, marker.context)
+            direct = not _overrides(type(instance), Entity, '__setitem__')
+            lazy = marker.context.lazy and instance._es_index_ is None
 
             for name, val in value.items():
                 key, property = None, None
@@ -650,14 +901,23 @@ class Entity(Composite):
                 if key is None:
                     continue
                 with marker.cursor(name, val):
+                    if lazy and val is not None and _deferrable(property):
+                        instance._defer_(key, property, val, marker.context)
+                        continue
                     if isinstance(property, Selector):
-                        val = property.select(self).load(val, marker.context)
+                        val = yield (property.select(self), val, marker.context)
                     else:
-                        val = property.load(val, marker.context)
+                        val = yield (property, val, marker.context)
                     if val is None:
                         val = Null
-                    instance[key] = val
-            return instance
+                    if direct and type(property).__set__ is Property.__set__:
+                        # load 한 값을 __set__ 으로 다시 load 하지 않는다.
+                        if val is Null and property._pm_opts_.required:
+                            raise ValueError()
+                        instance._set_(key, val)
+                    else:
+                        instance[key] = val
+        yield _Result(instance)
 
     #
     # patch
@@ -936,6 +1196,8 @@ class Union(Composite):
     :py:meth:`Union.load` 할 때는 값이 어떤 :py:class:`Property` 에 해당하는지 차례대로 조사해서,
     첫번째 매치를 만나면 해당 :py:class:`Property` 의 어트리뷰트에 값을 부여한다.
     매치를 발견할 수 없으면 :py:exc:`ValueError` 예외를 발생시킨다.
+    값의 타입, :py:class:`Tuple` 의 길이, :py:class:`Entity` 의 :py:class:`Kind` 와 키들로 보아 매치될 수 없는 것이 분명한
+    :py:class:`Property` 는 시도하지 않고 건너뛴다. 이 때문에 선택되는 :py:class:`Property` 가 달라지지는 않는다. (Since version 1.1)
 
     :py:class:`Property` 의 ``ordered`` 옵션은 이 순서에 영향을 준다. 앞선 :py:class:`Property` 가 먼저 검사된다.
     ``ordered`` 가 정의되지 않을 경우 순서는 임의로 결정되며, 매번 달라질 수 있다.
@@ -952,6 +1214,9 @@ class Union(Composite):
     _um_key_ = None
     _um_val_ = None
 
+    def __reduce__(self):
+        return _unpickle_union, (self.__class__, self._um_key_, self._um_val_) + _pickle_state(self)
+
     def __repr__(self, args=None, opts=None):
         if self._um_key_ is not None:
             if args is None:
@@ -1038,7 +1303,7 @@ class Union(Composite):
         if isinstance(value, self.__class__):
             return value
         instance = self.__class__(**self._pm_opts_.__dict__)
-        for key, p in self._cs_fields_.items():
+        for key, p in _union_candidates(self.__class__, value, context):
             if p._isvisible_(context):
                 try:
                     ctx = None if context is None else context.copy()
@@ -1057,9 +1322,1134 @@ class Union(Composite):
         return self._um_val_ == (other._um_val_ if isinstance(other, Union) else other)
 
 
+#
+# view plans
+#
+
+class _ViewPlan(object):
+    # (only, view) 에서 노출되는 Property 들. is_visible 을 매번 평가하지 않도록 Entity 클래스별로 캐시한다.
+    # mask 는 _cs_fields_ 순서대로 노출 여부를 나열한다. _isvisible_ 을 재정의한 Property 는 view 를 반영하지 않는다.
+    # keys 와 fields 는 _isvisible_ 을 재정의한 Property 가 없을 때만 제공된다.
+    __slots__ = ('mask', 'keys', 'fields')
+
+    def __init__(self, cls, only, view):
+        mask = []
+        dynamic = False
+        for key, property in cls._cs_fields_.items():
+            opts = property._pm_opts_
+            if opts.required:
+                visible = True
+            elif only and key not in only:
+                visible = False
+            elif _overrides(type(property), Property, '_isvisible_'):
+                visible = dynamic = True
+            else:
+                visible = opts.view is None or view is None or opts.view.issuperset(view)
+            mask.append(visible)
+        self.mask = tuple(mask)
+        if dynamic:
+            self.keys = self.fields = None
+        else:
+            fields = cls._cs_fields_
+            self.keys = tuple(key for key, visible in zip(fields, mask) if visible)
+            self.fields = dict((fields[key]._pm_opts_.get('name', key), (key, fields[key])) for key in self.keys)
+
+
+def _get_plan(cls, only, view):
+    plans = cls.__dict__.get('_es_plans_')
+    if plans is None:
+        plans = cls._es_plans_ = {}
+    try:
+        plan = plans.get((only, view))
+    except TypeError:
+        # Context 를 만든 후에 view 를 unhashable 한 값으로 바꾼 경우
+        return _ViewPlan(cls, only, view)
+    if plan is None:
+        plan = plans[(only, view)] = _ViewPlan(cls, only, view)
+    return plan
+
+
+def _view_mask(cls, only, view):
+    return _get_plan(cls, only, view).mask
+
+
+def _view_plan(property, cls, context):
+    # property 가 cls 의 인스턴스를 load 하거나 dump 할 때 사용할 _ViewPlan. is_visible 을 재정의했으면 None.
+    if _overrides(type(property), Entity, 'is_visible'):
+        return None
+    plan = _get_plan(cls, property._pm_opts_.only, context.view)
+    return plan if plan.keys is not None else None
+
+
+def _has_views(cls):
+    # view 옵션을 사용하는 Property 가 있으면 컴파일한 코드가 _ViewPlan.mask 를 사용한다.
+    return any(p._pm_opts_.view is not None and not p._pm_opts_.required for p in cls._cs_fields_.values())
+
+
+#
+# union dispatch
+#
+
+def _accepts(property):
+    # (Proxy 를 해석한 property, property 의 load 가 받아들이는 값의 타입들).
+    # load 과정을 재정의했거나 코덱을 쓰는 등 알 수 없으면 None.
+    if isinstance(property, Proxy):
+        try:
+            property = property.resolve()
+        except Exception:
+            return None
+    opts = property._pm_opts_
+    if opts.codec is not None or isinstance(property, Tuple) and opts.batch:
+        return None
+    for klass in type(property).__mro__:
+        if '_ps_accepts_' in klass.__dict__ and '_load_' in klass.__dict__:
+            return property, klass.__dict__['_ps_accepts_']
+        if any(name in klass.__dict__ for name in ('load', '_load', '_load_', '_load_steps_')):
+            return None
+    return None
+
+
+def _union_dispatch(cls):
+    # Union 의 Property 들을 정의 순서대로 나열하고, load 가 받아들이는 타입들을 미리 구해둔다.
+    with _schema_lock:
+        if '_us_dispatch_' not in cls.__dict__:
+            branches = [(key, p, _accepts(p)) for key, p in cls._cs_fields_.items()]
+            cls._us_dispatch_ = (branches, {})
+        return cls._us_dispatch_
+
+
+def _union_candidates(cls, value, context):
+    # cls 의 Property 들 중 value 를 load 할 수 있을지도 모르는 것들을 순서대로 돌려준다.
+    # 값의 타입으로 먼저 거르고, Tuple 의 길이와 Entity 의 Kind 와 키들을 검사한다. 실패할 것이 분명한 것들만 제외한다.
+    dispatch = cls.__dict__.get('_us_dispatch_') or _union_dispatch(cls)
+    branches, types = dispatch
+    if value is None:
+        return [(key, p) for key, p, accepts in branches]
+    t = type(value)
+    candidates = types.get(t)
+    if candidates is None:
+        candidates = [(key, p, accepts) for key, p, accepts in branches
+                      if accepts is None or issubclass(t, accepts[1])]
+        types[t] = candidates
+    strict = context is not None and context.strict
+    return [(key, p) for key, p, accepts in candidates if accepts is None or _may_load(accepts[0], value, strict)]
+
+
+def _may_load(property, value, strict):
+    # property.load(value) 가 실패할 것이 분명하면 False.
+    if isinstance(property, Entity):
+        if not isinstance(value, dict):
+            return property._isloaded(value)
+        if property._cs_kind_key_ is None:
+            klass = property.__class__
+        else:
+            kind_name = property._cs_fields_[property._cs_kind_key_]._pm_opts_.get('name', property._cs_kind_key_)
+            try:
+                klass = property._cs_kind_ns_.get(value.get(kind_name))
+            except TypeError:
+                return False
+            if klass is None or not issubclass(klass, property.__class__):
+                return False
+        if strict:
+            names = klass._es_names_
+            return all(name in names for name in value)
+        return True
+    if isinstance(property, Tuple):
+        if not isinstance(value, (tuple, list)):
+            return isinstance(value, _LazyTuple)
+        try:
+            property._check_length_(value, property._pm_opts_.repeat)
+        except Exception:
+            return False
+    return True
+
+
+#
+# slots storage
+#
+
+class _SlotsData(MutableMapping):
+    # slots 옵션을 사용하는 Entity 의 _em_data_. _em_values_ 를 dict 처럼 보여준다.
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, instance):
+        self._index = instance._es_index_
+        self._values = instance._em_values_
+
+    def __getitem__(self, key):
+        i = self._index.get(key)
+        if i is not None:
+            value = self._values[i]
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        i = self._index.get(key)
+        if i is None:
+            raise KeyError(key)
+        self._values[i] = value
+
+    def __delitem__(self, key):
+        i = self._index.get(key)
+        if i is None or self._values[i] is None:
+            raise KeyError(key)
+        self._values[i] = None
+
+    def __iter__(self):
+        values = self._values
+        for key, i in self._index.items():
+            if values[i] is not None:
+                yield key
+
+    def __len__(self):
+        return len(self._values) - self._values.count(None)
+
+    def __contains__(self, key):
+        i = self._index.get(key)
+        return i is not None and self._values[i] is not None
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        if i is not None:
+            value = self._values[i]
+            if value is not None:
+                return value
+        return default
+
+    def clear(self):
+        self._values[:] = [None] * len(self._values)
+
+
+class _SlotsDataDescriptor(object):
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return _SlotsData(instance)
+
+    def __set__(self, instance, value):
+        instance._em_values_ = [None] * len(instance._es_index_)
+        if value:
+            _SlotsData(instance).update(value)
+
+
+def _slots_get(self, name):
+    i = self._es_index_.get(name)
+    if i is None:
+        return Entity._get_(self, name)
+    value = self._em_values_[i]
+    if value is None:
+        default = self._cs_fields_[name]._pm_opts_.default
+        if default is not None:
+            if callable(default):
+                default = default()
+            setattr(self, name, default)
+            value = self._em_values_[i]
+    return value
+
+
+def _slots_set(self, name, value):
+    self._em_values_[self._es_index_[name]] = value
+
+
+def _slots_delete(self, name):
+    self._em_values_[self._es_index_[name]] = None
+
+
+def _slots_contains(self, key):
+    i = self._es_index_.get(key)
+    return i is not None and self._em_values_[i] is not None
+
+
+_slots_methods = {
+    '_get_': _slots_get,
+    '_set_': _slots_set,
+    '_delete_': _slots_delete,
+    '__contains__': _slots_contains,
+}
+
+
+def _storage_index(cls):
+    # Kind 를 제외한 Property 들에 정의 순서대로 번호를 붙인다.
+    keys = [key for key, property in cls._cs_fields_.items() if not isinstance(property, Kind)]
+    return OrderedDict((key, i) for i, key in enumerate(keys))
+
+
+#
+# cache storage
+#
+
+class _CachedData(dict):
+    # cache 옵션을 사용하는 Entity 의 _em_data_.
+    # cache 는 {(only, view, explicit): (global codecs, JSON 조각)}, parents 는 자신을 값으로 갖는 _CachedData 들의 weakref 목록이다.
+    # cache 가 False 면 캐시할 수 없는 값을 포함하고 있다는 뜻이다. 값이 바뀌면 자신과 조상들의 캐시를 버린다.
+    __slots__ = ('cache', 'parents', '__weakref__')
+
+    def __init__(self, *args, **kwargs):
+        super(_CachedData, self).__init__(*args, **kwargs)
+        self.cache = None
+        self.parents = None
+
+    def invalidate(self):
+        self.cache = None
+        parents, self.parents = self.parents, None
+        if parents:
+            for ref in parents:
+                parent = ref()
+                if parent is not None:
+                    parent.invalidate()
+
+    def __setitem__(self, key, value):
+        self.invalidate()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.invalidate()
+        dict.__delitem__(self, key)
+
+    def clear(self):
+        self.invalidate()
+        dict.clear(self)
+
+    def pop(self, key, *args):
+        self.invalidate()
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        self.invalidate()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self.invalidate()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self.invalidate()
+        dict.update(self, *args, **kwargs)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+_immutable_types = text_types + integer_types + (
+    bytes_type, bool, float, complex, decimal.Decimal, datetime.date, datetime.time, datetime.timedelta, uuid.UUID,
+    _Null, type(None))
+
+
+def _cache_key(property, context):
+    # 같은 값이 같은 JSON 조각이 되는 조건들. Context-local 코덱이 있으면 캐시하지 않는다.
+    if context._explicit_:
+        if context._cm_codecs_:
+            return None
+        return property._pm_opts_.only, context.view, True
+    return property._pm_opts_.only, context.view, False
+
+
+def _track(data):
+    # data 의 값들이 모두 불변이거나 캐시되는 Entity 면 자식들에 data 를 등록하고 True 를 돌려준다.
+    cache = data.cache
+    if cache is not None:
+        return cache is not False
+    ref = None
+    stack = list(data.values())
+    while stack:
+        value = stack.pop()
+        if isinstance(value, _immutable_types):
+            continue
+        if type(value) is tuple:
+            stack.extend(value)
+            continue
+        child = value._em_data_ if isinstance(value, Entity) else None
+        if type(child) is not _CachedData or not _track(child):
+            data.cache = False
+            return False
+        if ref is None:
+            ref = weakref.ref(data)
+        parents = child.parents
+        if parents is None:
+            child.parents = [ref]
+        elif not any(r() is data for r in parents):
+            parents[:] = [r for r in parents if r() is not None]
+            parents.append(ref)
+    data.cache = {}
+    return True
+
+
+#
+# pickle
+#
+
+def _pickle_info(cls):
+    # unpickle 에 필요한 클래스별 정보. 값들의 키와, 옵션이 없는 인스턴스들이 공유하는 Options.
+    info = cls.__dict__.get('_es_pickle_')
+    if info is None:
+        info = (tuple(_storage_index(cls)), getattr(cls, cls.MetaOptions._options)())
+        cls._es_pickle_ = info
+    return info
+
+
+def _pickle_state(instance, skip=('_um_key_', '_um_val_')):
+    # 옵션과, 스키마로 사용되는 경우의 이름과 순서, 인스턴스 어트리뷰트. 없으면 생략한다.
+    extra = dict((k, v) for k, v in getattr(instance, '__dict__', {}).items() if k not in skip)
+    for name in ('_pm_key_', '_pm_order_'):
+        value = getattr(instance, name)
+        if value is not None:
+            extra[name] = value
+    if extra:
+        return instance._pm_opts_.__dict__, extra
+    if instance._pm_opts_.__dict__:
+        return instance._pm_opts_.__dict__,
+    return ()
+
+
+def _unpickle_options(instance, cls, opts, extra):
+    options = _pickle_info(cls)[1]
+    object.__setattr__(instance, '_pm_opts_', type(options)(**opts) if opts else options)
+    if extra:
+        for name, value in extra.items():
+            object.__setattr__(instance, name, value)
+
+
+def _reduce_entity(entity, cls):
+    if cls._es_index_ is not None and type(entity) is cls:
+        values = tuple(entity._em_values_)
+    else:
+        data = entity._em_data_
+        values = tuple([data.get(key) for key in _pickle_info(cls)[0]])
+    return _unpickle_entity, (cls, values) + _pickle_state(entity)
+
+
+def _unpickle_entity(cls, values, opts=None, extra=None):
+    instance = object.__new__(cls)
+    if cls._es_index_ is None:
+        object.__setattr__(instance, '_em_data_',
+                           cls._es_data_((k, v) for k, v in zip(_pickle_info(cls)[0], values) if v is not None))
+    else:
+        object.__setattr__(instance, '_em_values_', list(values))
+    _unpickle_options(instance, cls, opts, extra)
+    return instance
+
+
+def _unpickle_union(cls, key, value, opts=None, extra=None):
+    instance = object.__new__(cls)
+    _unpickle_options(instance, cls, opts, extra)
+    if key is not None:
+        instance._set_(key, value)
+    return instance
+
+
+def _unpickle_batch(cls, opts, columns, types, length):
+    batch = EntityBatch(cls, **opts)
+    batch._columns = columns
+    batch._types = types
+    batch._length = length
+    return batch
+
+
+#
+# lazy loading
+#
+
+class _Deferred(object):
+    # Context 의 lazy 옵션으로 load 를 미뤄둔 값.
+    __slots__ = ('property', 'value')
+
+    def __init__(self, property, value):
+        self.property = property
+        self.value = value
+
+
+class _LazyData(MutableMapping):
+    # 미뤄둔 값을 포함하는 Entity 의 _em_data_. 미뤄둔 값은 처음 읽을 때 load 해서 보관한다.
+    __slots__ = ('_data', '_context')
+
+    def __init__(self, data, context):
+        self._data = data
+        self._context = context
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if type(value) is _Deferred:
+            value = self._data[key] = self._resolve(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        value = self._data.get(key, default)
+        if type(value) is _Deferred:
+            value = self._data[key] = self._resolve(key, value)
+        return value
+
+    def clear(self):
+        self._data.clear()
+
+    def _resolve(self, key, deferred):
+        context = self._context.copy()
+        try:
+            value = deferred.property.load(deferred.value, context)
+        except ValueError as e:
+            errors = context.errors
+            raise ValueError('/%s%s' % (key, errors[0].location if errors else ': %s' % e))
+        return Null if value is None else value
+
+
+#
+# columnar storage
+#
+
+class EntityBatch(Sequence):
+    """
+    한 :py:class:`Entity` 클래스의 인스턴스들을 열(column) 단위로 저장하는 컨테이너.
+
+    :py:class:`Property` 마다 하나의 :py:class:`list` 를 사용하는데, 모든 값이 :py:class:`float` 이거나 :py:class:`int` 이거나
+    :py:class:`bool` 인 열은 :py:class:`array.array` 를 사용한다. 많은 수의 레코드를 다룰 때 메모리를 줄이고, :py:meth:`EntityBatch.column` 으로 특정
+    :py:class:`Property` 의 값들을 빠르게 훑을 수 있다.
+
+    ``entity_class`` 로 :py:class:`Entity` 클래스를 제공한다. ``rows`` 로 그 인스턴스들을 제공할 수 있고, ``kwargs`` 는 행들의 옵션이다.
+
+    행은 :py:class:`Sequence` 인터페이스로 접근하는데, ``entity_class`` 의 인스턴스처럼 동작하는 프락시가 제공된다.
+    프락시를 수정하면 :py:class:`EntityBatch` 가 수정된다. :py:meth:`Entity.copy` 는 ``entity_class`` 의 인스턴스를 만든다.
+
+    ``entity_class`` 의 인스턴스만 저장할 수 있다. 즉 다형성은 지원하지 않는다.
+
+    :py:class:`Tuple` 에 ``batch`` 옵션을 주면 :py:class:`tuple` 대신 :py:class:`EntityBatch` 로 load 한다.
+
+    Example
+
+        .. literalinclude:: /../tests/ex/entity_batch.rst
+
+    Since version 1.1.
+    """
+    __hash__ = None
+
+    def __init__(self, entity_class, rows=(), **kwargs):
+        if not (isinstance(entity_class, type) and issubclass(entity_class, Entity)):
+            raise TypeError('EntityBatch expects Entity class, but given %s' % repr(entity_class))
+        self._class = entity_class
+        self._rowclass = entity_class.__dict__.get('_es_batch_row_') or _batch_row_class(entity_class)
+        self._opts = getattr(entity_class, entity_class.MetaOptions._options)(**kwargs)
+        self._index = _storage_index(entity_class)
+        self._columns = [[] for _ in self._index]
+        self._types = [None] * len(self._index)  # array.array 를 사용하는 열의 값 타입
+        self._length = 0
+        self.extend(rows)
+
+    def __repr__(self):
+        return 'EntityBatch(%s, %d rows)' % (self._class.__name__, self._length)
+
+    def __reduce__(self):
+        return _unpickle_batch, (self._class, self._opts.__dict__, self._columns, self._types, self._length)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = EntityBatch(self._class)
+            batch._opts = self._opts
+            batch._columns = [column[index] for column in self._columns]
+            batch._types = list(self._types)
+            batch._length = len(range(*index.indices(self._length)))
+            return batch
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('EntityBatch index out of range')
+        return self._row(index)
+
+    def __iter__(self):
+        for row in range(self._length):
+            yield self._row(row)
+
+    def __eq__(self, other):
+        if not isinstance(other, EntityBatch):
+            return NotImplemented
+        return self._class is other._class and self._length == other._length and all(
+            list(a) == list(b) for a, b in zip(self._columns, other._columns))
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def append(self, entity):
+        """
+        ``entity_class`` 의 인스턴스를 행으로 추가한다.
+
+        다른 값이 제공되면 :py:exc:`ValueError` 예외를 일으킨다.
+
+        Since version 1.1.
+        """
+        if type(entity) is not self._class and not (
+                        isinstance(entity, _BatchRow) and entity._eb_batch_._class is self._class):
+            raise ValueError('EntityBatch expects %s, but given %s' % (self._class.__name__, repr(entity)))
+        data = entity._em_data_
+        if not self._length:
+            self._start(data)
+        columns, types = self._columns, self._types
+        for key, i in self._index.items():
+            value = data.get(key)
+            vtype = types[i]
+            if vtype is None:
+                columns[i].append(value)
+            else:
+                if type(value) is not vtype:
+                    self._demote(i)
+                try:
+                    columns[i].append(value)
+                except OverflowError:
+                    self._demote(i).append(value)
+        self._length += 1
+
+    def extend(self, entities):
+        """
+        ``entities`` 의 인스턴스들을 차례로 :py:meth:`EntityBatch.append` 한다.
+
+        Since version 1.1.
+        """
+        for entity in entities:
+            self.append(entity)
+
+    def column(self, key):
+        """
+        ``key`` 로 지정한 :py:class:`Property` 의 값들을 행의 순서대로 돌려준다.
+
+        :py:class:`list` 나 :py:class:`array.array` 다. :py:class:`bool` 열은 :py:class:`array.array` 에 저장하고 :py:class:`bool` 을
+        돌려주는 시퀀스다. 값이 없는 행은 None 이다. 돌려준 값을 수정해서는 안된다.
+
+        Since version 1.1.
+        """
+        return self._columns[self._index[key]]
+
+    def array(self, key):
+        """
+        :py:meth:`EntityBatch.column` 을 NumPy 배열로 돌려준다.
+
+        NumPy 가 설치되어 있어야 한다. 값이 없는 행이 있으면 ``dtype`` 은 ``object`` 가 된다.
+
+        Since version 1.1.
+        """
+        column = self.column(key)
+        if isinstance(column, _BoolColumn):
+            return numpy.array(column._data, dtype=bool)
+        return numpy.array(column)
+
+    def _start(self, data):
+        # 첫 행의 값들로 열의 저장 방식을 정한다.
+        for key, i in self._index.items():
+            vtype = type(data.get(key))
+            typecode = _array_typecodes.get(vtype)
+            if typecode is not None:
+                self._columns[i] = _BoolColumn() if vtype is bool else array.array(typecode)
+                self._types[i] = vtype
+
+    def _demote(self, i):
+        # array.array 로 담을 수 없는 값이 들어오면 list 로 바꾼다.
+        column = self._columns[i]
+        if self._types[i] is not None:
+            column = self._columns[i] = list(column)
+            self._types[i] = None
+        return column
+
+    def _row(self, row):
+        setattr_ = object.__setattr__
+        instance = object.__new__(self._rowclass)
+        setattr_(instance, '_pm_opts_', self._opts)
+        setattr_(instance, '_eb_batch_', self)
+        setattr_(instance, '_eb_row_', row)
+        return instance
+
+    def _get_value(self, key, row):
+        i = self._index.get(key)
+        if i is None:
+            return None
+        return self._columns[i][row]
+
+    def _set_value(self, key, row, value):
+        i = self._index[key]
+        column = self._columns[i]
+        vtype = self._types[i]
+        if vtype is not None and type(value) is not vtype:
+            column = self._demote(i)
+        try:
+            column[row] = value
+        except OverflowError:
+            self._demote(i)[row] = value
+
+
+_array_typecodes = {
+    float: 'd',
+    int: 'q' if PY3 else 'l',
+    bool: 'b',
+}
+
+
+class _BoolColumn(object):
+    # bool 값들의 열. array.array('b') 에 저장하고, 읽을 때 bool 로 돌려준다.
+    __slots__ = ('_data',)
+
+    def __init__(self, values=()):
+        self._data = array.array('b', values)
+
+    def __reduce__(self):
+        return _BoolColumn, (self._data,)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return map(bool, self._data) if PY3 else (bool(v) for v in self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _BoolColumn(self._data[index])
+        return bool(self._data[index])
+
+    def __setitem__(self, index, value):
+        self._data[index] = value
+
+    def append(self, value):
+        self._data.append(value)
+
+
+class _BatchRowData(MutableMapping):
+    # EntityBatch 행의 _em_data_.
+    __slots__ = ('_batch', '_row')
+
+    def __init__(self, batch, row):
+        self._batch = batch
+        self._row = row
+
+    def __getitem__(self, key):
+        value = self._batch._get_value(key, self._row)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._batch._index:
+            raise KeyError(key)
+        self._batch._set_value(key, self._row, value)
+
+    def __delitem__(self, key):
+        if self._batch._get_value(key, self._row) is None:
+            raise KeyError(key)
+        self._batch._set_value(key, self._row, None)
+
+    def __iter__(self):
+        for key in self._batch._index:
+            if self._batch._get_value(key, self._row) is not None:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        return self._batch._get_value(key, self._row) is not None
+
+    def get(self, key, default=None):
+        value = self._batch._get_value(key, self._row)
+        return default if value is None else value
+
+
+class _BatchRowDataDescriptor(object):
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return _BatchRowData(instance._eb_batch_, instance._eb_row_)
+
+    def __set__(self, instance, value):
+        data = _BatchRowData(instance._eb_batch_, instance._eb_row_)
+        data.clear()
+        data.update(value)
+
+
+class _BatchRow(object):
+    # EntityBatch 의 행을 Entity 처럼 보여주는 프락시 클래스들의 믹스인.
+    __slots__ = ()
+
+    _em_data_ = _BatchRowDataDescriptor()
+
+    def _get_(self, name):
+        value = self._eb_batch_._get_value(name, self._eb_row_)
+        if value is None:
+            if name == self._cs_kind_key_:
+                return self._cs_fields_[name].kind
+            default = self._cs_fields_[name]._pm_opts_.default
+            if default is not None:
+                if callable(default):
+                    default = default()
+                setattr(self, name, default)
+                value = self._eb_batch_._get_value(name, self._eb_row_)
+        return value
+
+    def _set_(self, name, value):
+        self._eb_batch_._set_value(name, self._eb_row_, value)
+
+    def _delete_(self, name):
+        self._eb_batch_._set_value(name, self._eb_row_, None)
+
+    def __contains__(self, key):
+        return self._eb_batch_._get_value(key, self._eb_row_) is not None
+
+    def _copy_(self, *args, **kwargs):
+        kwargs.update(self._pm_opts_.__dict__)
+        instance = self._eb_batch_._class(*args, **kwargs)
+        instance._em_data_.update(self._em_data_)
+        return instance
+
+    def __reduce__(self):
+        # 행은 entity_class 의 인스턴스로 pickle 한다.
+        return _reduce_entity(self, self._eb_batch_._class)
+
+
+def _batch_row_class(cls):
+    # cls 를 계승하는 프락시 클래스를 만든다. Kind 값을 정의하지 않기 때문에 cls 의 다형성에는 영향을 주지 않는다.
+    with _schema_lock:
+        if '_es_batch_row_' in cls.__dict__:
+            return cls._es_batch_row_
+        attrs = {
+            '__module__': cls.__module__,
+            '__slots__': ('_eb_batch_', '_eb_row_'),
+            cls.MetaOptions._metaoptions: type('Meta', (object,), dict(cls._ts_opts_.__dict__)),
+        }
+        rowclass = TypeMeta(cls.__name__, (_BatchRow, cls), attrs)
+        if cls._cs_kind_key_ is not None:
+            # _cs_kind_ns_ 에 등록하지 않고 cls 의 Kind 값을 물려받는다.
+            rowclass._cs_fields_[cls._cs_kind_key_] = cls._cs_fields_[cls._cs_kind_key_]
+        cls._es_batch_row_ = rowclass
+        return rowclass
+
+
+#
+# code generation
+#
+
+_missing = object()
+
+
+def _overrides(cls, base, name):
+    for klass in cls.__mro__:
+        if klass is base:
+            return False
+        if klass is _BatchRow:
+            # EntityBatch 의 프락시가 제공하는 구현은 재정의로 보지 않는다.
+            continue
+        if name in klass.__dict__:
+            # slots 옵션이 제공하는 구현은 재정의로 보지 않는다.
+            return klass.__dict__[name] is not _slots_methods.get(name)
+    return False
+
+
+def _build_function(name, lines, namespace, cls):
+    code = compile('\n'.join(lines) + '\n', '<meta:%s.%s>' % (cls.__name__, name), 'exec')
+    exec (code, namespace)
+    return namespace[name]
+
+
+def _compile(cls):
+    # 생성된 함수는 완성된 후에 클래스에 설치되므로, 읽는 쪽은 잠그지 않고 사용한다.
+    with _schema_lock:
+        for attr, compiler in (('_es_loader_', _compile_loader), ('_es_dumper_', _compile_dumper),
+                               ('_es_writer_', _compile_writer)):
+            if attr not in cls.__dict__:
+                try:
+                    setattr(cls, attr, compiler(cls))
+                except ReferenceError:
+                    pass
+
+
+def _resolve(cls, property):
+    if isinstance(property, Proxy):
+        if property.owner is not cls:
+            return None
+        property = property.resolve()
+    return property
+
+
+def _compile_loader(cls):
+    # Entity._load_ 의 dict 처리를 cls 에 맞게 펼친 코드를 만든다.
+    # 값들은 입력 순서가 아니라 선언 순서로 처리하는데, 에러가 발생하면 Entity._load_ 가 입력 순서로 다시 실행한다.
+    if _overrides(cls, Entity, '__setitem__'):
+        return None
+    namespace = {'klass': cls, 'Null': Null, 'MISSING': _missing, 'view_mask': _view_mask}
+    lines = [
+        'def load(self, value, context):',
+        '    instance = self._new_value_(klass)',
+        '    only = self._pm_opts_.only',
+        '    get = value.get',
+        '    lazy = context.lazy',
+        '    n = 0',
+    ]
+    masked = _has_views(cls)
+    if masked:
+        lines.append('    mask = view_mask(klass, only, context.view)')
+    for i, (key, property) in enumerate(list(cls._cs_fields_.items())):
+        property = _resolve(cls, property)
+        if property is None:
+            return None
+        p = 'p%d' % i
+        namespace[p] = property
+        opts = property._pm_opts_
+        lines.append('    v = get(%r, MISSING)' % opts.get('name', key))
+        lines.append('    if v is not MISSING:')
+        indent = ' ' * 8
+        if key == cls._cs_kind_key_:
+            lines.append(indent + 'n += 1')
+            continue
+        if not opts.required:
+            if masked:
+                lines.append(indent + 'if mask[%d]:' % i)
+            else:
+                lines.append(indent + 'if not only or %r in only:' % key)
+            indent += ' ' * 4
+            if _overrides(type(property), Property, '_isvisible_') or opts.view is not None and not masked:
+                lines.append(indent + 'if %s._isvisible_(context):' % p)
+                indent += ' ' * 4
+        lines.append(indent + 'n += 1')
+        if isinstance(property, Selector):
+            lines.append(indent + 'v = %s.select(self).load(v, context)' % p)
+        elif _overrides(type(property), Property, 'load'):
+            lines.append(indent + 'v = %s.load(v, context)' % p)
+        else:
+            lines.append(indent + 'if v is None:')
+            if opts.required:
+                lines.append(indent + '    raise ValueError()')
+            else:
+                lines.append(indent + '    instance._set_(%r, Null)' % key)
+            if cls._es_index_ is None and _deferrable(property):
+                lines.append(indent + 'elif lazy:')
+                lines.append(indent + '    instance._defer_(%r, %s, v, context)' % (key, p))
+            lines.append(indent + 'else:')
+            indent += ' ' * 4
+            lines.append(indent + 'v = %s.load(v, context)' % p)
+        if type(property).__set__ is not Property.__set__:
+            lines.append(indent + '%s.__set__(instance, Null if v is None else v)' % p)
+        elif opts.required:
+            # load 한 값을 __set__ 으로 다시 load 하지 않는다.
+            lines.append(indent + 'if v is None:')
+            lines.append(indent + '    raise ValueError()')
+            lines.append(indent + 'instance._set_(%r, v)' % key)
+        else:
+            lines.append(indent + 'instance._set_(%r, Null if v is None else v)' % key)
+    lines.extend([
+        '    if n != len(value) and context.strict:',
+        '        raise ValueError()',
+        '    return instance',
+    ])
+    return _build_function('load', lines, namespace, cls)
+
+
+def _compile_fields(cls, namespace, lines, emit):
+    # Entity._prepare_dump_ 처럼 노출되는 값을 v 로 가져오는 코드를 만든다. v 를 기록하는 코드는 emit 이 만든다.
+    # emit(indent, i, property, name, kind) 에서 kind 는 Kind 의 값이고, 이 때는 v 를 가져오지 않는다.
+    for name in ('_dump_', '_prepare_dump_', 'is_visible', '_get_'):
+        if _overrides(cls, Entity, name):
+            return False
+    batch = issubclass(cls, _BatchRow)
+    index = _storage_index(cls) if batch else cls._es_index_
+    if batch:
+        lines.append('    columns = value._eb_batch_._columns')
+        lines.append('    row = value._eb_row_')
+    elif index is None:
+        lines.append('    data = value._em_data_')
+    else:
+        lines.append('    values = value._em_values_')
+    masked = _has_views(cls)
+    if masked:
+        namespace['klass'] = cls
+        namespace['view_mask'] = _view_mask
+        lines.append('    mask = view_mask(klass, only, context.view)')
+    for i, (key, property) in enumerate(list(cls._cs_fields_.items())):
+        property = _resolve(cls, property)
+        if property is None:
+            return False
+        namespace['p%d' % i] = property
+        opts = property._pm_opts_
+        name = opts.get('name', key)
+        if key == cls._cs_kind_key_:
+            if property.kind is not None:
+                emit(' ' * 4, i, property, name, property.kind)
+            continue
+        indent = ' ' * 4
+        if not opts.required:
+            if masked:
+                lines.append(indent + 'if mask[%d]:' % i)
+            else:
+                lines.append(indent + 'if not only or %r in only:' % key)
+            indent += ' ' * 4
+            if _overrides(type(property), Property, '_isvisible_') or opts.view is not None and not masked:
+                lines.append(indent + 'if p%d._isvisible_(context):' % i)
+                indent += ' ' * 4
+        if opts.default is not None:
+            lines.append(indent + 'v = value._get_(%r)' % key)
+        elif batch:
+            lines.append(indent + 'v = columns[%d][row]' % index[key])
+        elif index is not None:
+            lines.append(indent + 'v = values[%d]' % index[key])
+        else:
+            lines.append(indent + 'v = data.get(%r)' % key)
+        emit(indent, i, property, name, None)
+    return True
+
+
+def _compile_dumper(cls):
+    # Entity._prepare_dump_ 를 cls 에 맞게 펼친 코드를 만든다. 중간 목록 없이 결과에 바로 기록한다.
+    namespace = {'Encoded': type(cls._cs_fields_), 'Null': Null}
+    lines = [
+        'def dump(self, value, context):',
+        '    only = self._pm_opts_.only',
+        '    encoded = Encoded()',
+    ]
+
+    def emit(indent, i, property, name, kind):
+        if kind is not None:
+            namespace['k%d' % i] = kind
+            lines.append(indent + 'encoded[%r] = k%d' % (name, i))
+            return
+        lines.append(indent + 'if v is Null:')
+        lines.append(indent + '    encoded[%r] = None' % name)
+        lines.append(indent + 'elif v is not None:')
+        if isinstance(property, Selector):
+            lines.append(indent + '    encoded[%r] = p%d.select(self).dump(v, context)' % (name, i))
+        else:
+            lines.append(indent + '    encoded[%r] = p%d.dump(v, context)' % (name, i))
+
+    if not _compile_fields(cls, namespace, lines, emit):
+        return None
+    lines.append('    return encoded')
+    return _build_function('dump', lines, namespace, cls)
+
+
+def _deferrable(property):
+    # Context 의 lazy 옵션이 load 를 미루는 property.
+    return isinstance(property, (Composite, Tuple)) and not _overrides(type(property), Property, 'load')
+
+
+def _inline_entity(property):
+    # _compile_writer 가 property 의 값을 JSON 으로 직접 기록할 수 있으면 True.
+    return isinstance(property, Entity) and property._pm_opts_.codec is None
+
+
+def _compile_writer(cls):
+    # _compile_dumper 와 같은 순서로 값들을 방문하면서, dict 대신 JSON 조각들을 parts 에 기록한다.
+    # 키 조각들은 미리 인코딩해둔다. 문자열과 유한한 숫자는 json 인코더를 거치지 않는다. Entity 나 Entity 의 Tuple 인 값들은 재귀적으로 기록한다.
+    namespace = {'Null': Null, 'encode': _json_encode, 'quote': _json_quote, 'text': unicode_type,
+                 'inf': float('inf'), 'write_entity': _write_entity, 'write_entities': _write_entities}
+    lines = [
+        'def write(self, value, context, parts):',
+        '    only = self._pm_opts_.only',
+        '    append = parts.append',
+        '    start = len(parts)',
+    ]
+
+    def emit(indent, i, property, name, kind):
+        key = u',' + _json_quote(name) + u':'
+        if kind is not None:
+            namespace['k%d' % i] = key + _json_encode(kind)
+            lines.append(indent + 'append(k%d)' % i)
+            return
+        namespace['k%d' % i] = key
+        namespace['n%d' % i] = key + u'null'
+        lines.append(indent + 'if v is Null:')
+        lines.append(indent + '    append(n%d)' % i)
+        lines.append(indent + 'elif v is not None:')
+        lines.append(indent + '    append(k%d)' % i)
+        if isinstance(property, Selector):
+            lines.append(indent + '    append(encode(p%d.select(self).dump(v, context)))' % i)
+        elif _inline_entity(property):
+            lines.append(indent + '    write_entity(p%d, v, context, parts)' % i)
+        elif isinstance(property, Tuple) and property._pm_opts_.codec is None and len(
+                property.get_components()) == 1 and _inline_entity(property.get_components()[0]) and not (
+                    property.get_components()[0]._pm_opts_.view is not None or
+                    _overrides(type(property.get_components()[0]), Property, '_isvisible_')):
+            namespace['c%d' % i] = property.get_components()[0]
+            lines.append(indent + '    write_entities(c%d, v, context, parts)' % i)
+        else:
+            lines.append(indent + '    v = p%d.dump(v, context)' % i)
+            lines.append(indent + '    t = type(v)')
+            lines.append(indent + '    if t is text:')
+            lines.append(indent + '        append(quote(v))')
+            lines.append(indent + '    elif t is int or t is float and -inf < v < inf:')
+            lines.append(indent + '        append(repr(v))')
+            lines.append(indent + '    else:')
+            lines.append(indent + '        append(encode(v))')
+
+    if not _compile_fields(cls, namespace, lines, emit):
+        return None
+    lines.append('    if len(parts) > start:')
+    lines.append("        parts[start] = u'{' + parts[start][1:]")
+    lines.append('    else:')
+    lines.append("        append(u'{')")
+    lines.append("    append(u'}')")
+    return _build_function('write', lines, namespace, cls)
+
+
+def _write_entity(property, value, context, parts):
+    # cache 옵션을 사용하는 Entity 는 기록한 JSON 조각을 보관했다가 값이 바뀌기 전까지 재사용한다.
+    data = value._em_data_
+    if type(data) is _CachedData:
+        key = _cache_key(property, context)
+        if key is not None:
+            codecs = Context._cs_codecs_
+            cache = data.cache
+            if cache:
+                entry = cache.get(key)
+                if entry is not None and entry[0] is codecs:
+                    parts.append(entry[1])
+                    return
+            start = len(parts)
+            _write_entity_nocache(property, value, context, parts)
+            fragment = u''.join(parts[start:])
+            parts[start:] = [fragment]
+            if _track(data):
+                data.cache[key] = (codecs, fragment)
+            return
+    _write_entity_nocache(property, value, context, parts)
+
+
+def _write_entity_nocache(property, value, context, parts):
+    writer = property._dumper_(value, '_es_writer_')
+    if writer:
+        writer(property, value, context, parts)
+    else:
+        parts.append(_json_encode(property.dump(value, context)))
+
+
+def _write_entities(property, values, context, parts):
+    # 하나의 Entity 로 구성된 Tuple 의 값을 기록한다.
+    start = len(parts)
+    for value in values:
+        if value is None:
+            parts.append(u',null')
+        else:
+            parts.append(u',')
+            _write_entity(property, value, context, parts)
+    if len(parts) > start:
+        parts[start] = u'[' + parts[start][1:]
+    else:
+        parts.append(u'[')
+    parts.append(u']')
+
+
 __all__ = [
     'Kind',
     'Entity',
+    'EntityBatch',
     'Selector',
     'Union',
 ]
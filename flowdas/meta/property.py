@@ -4,12 +4,18 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
+import copy
 import inspect
 import itertools
 import json
+import multiprocessing
+import pickle
 import sys
+import threading
+import types
 from collections import OrderedDict
 from contextlib import contextmanager
+from timeit import default_timer
 
 from .compat import *
 from .type import Type
@@ -21,6 +27,9 @@ class _Null(object):
     def __repr__(self):
         return 'Null'
 
+    def __reduce__(self):
+        return 'Null'
+
     def __bool__(self):
         return False
 
@@ -30,6 +39,11 @@ class _Null(object):
 Null = _Null()
 
 
+# Proxy 해석이나 코드 생성처럼 스키마를 처음 사용할 때 한 번 일어나는 변경들을 보호한다.
+# 변경이 끝난 후에 읽는 쪽은 잠그지 않는다.
+_schema_lock = threading.RLock()
+
+
 class Error(object):
     def __init__(self, path):
         value = path[-1]
@@ -69,6 +83,41 @@ class Context(Type.Options):
         False 면 :py:class:`Entity` 에서 정의되지 않은 키를 만나도 에러를 발생시키지 않고 무시한다.
 
         기본 값은 False.
+    optimistic
+        True 면 에러를 추적하지 않고 진행하다가, 에러가 발생했을 때만 에러를 추적하며 다시 실행한다.
+        입력이 대부분 올바른 경우 에러 추적에 드는 비용을 없앨 수 있다. ``errors`` 는 어느 경우건 같다.
+
+        대신 에러가 있는 입력에서는 에러가 발생한 지점까지의 변환이 두 번 실행된다. 부작용이 있는
+        ``validate`` 옵션, :py:meth:`Property._load_`, :py:class:`Codec` 은 그만큼 여러 번 호출된다.
+        ``context`` 없이 호출한 경우에도 마찬가지다.
+
+        False 면 처음부터 에러를 추적한다. 변환 과정에서 부작용이 있는 :py:class:`Property` 나 :py:class:`Codec` 이 두 번 실행되는 것을 피하고 싶을 때 사용한다.
+        이 때는 :py:class:`Entity` 의 생성된 코드와 ``cache`` 옵션도 사용되지 않는다.
+
+        기본 값은 True.
+
+        Since version 1.1.
+    lazy
+        True 면 :py:class:`Entity` 를 load 할 때 :py:class:`Entity`, :py:class:`Tuple`, :py:class:`Union` 인 값들을 변환하지 않고
+        JSON 값 그대로 보관한다. 처음 읽힐 때 (:py:meth:`Entity.dump`, :py:meth:`Entity.validate` 등에서 읽히는 경우도 포함한다)
+        같은 옵션으로 load 하고 결과를 보관한다. 큰 문서에서 일부 값만 사용하는 경우 변환 비용을 줄일 수 있다.
+
+        이 경우 미뤄둔 값의 에러는 값을 읽을 때 발견되고, 위치를 담은 :py:exc:`ValueError` 예외를 일으킨다.
+        ``slots`` 클래스 옵션을 사용하는 :py:class:`Entity` 에는 적용되지 않는다.
+
+        기본 값은 False.
+
+        Since version 1.1.
+    shared
+        True 면 여러 스레드가 하나의 인스턴스를 동시에 사용할 수 있다. 옵션과 :py:meth:`Context.set_codec` 으로 등록한 코덱은 공유되고,
+        순환 참조 검사와 ``errors`` 같은 진행 상태는 스레드별로 따로 관리된다. 즉 ``errors`` 와 :py:meth:`Context.reset` 은
+        호출한 스레드의 상태에 적용된다.
+
+        False 면 진행 상태를 인스턴스가 직접 갖기 때문에 한 번에 한 스레드에서만 사용해야 한다.
+
+        기본 값은 False.
+
+        Since version 1.1.
     view
         ``view`` 옵션이 지정된 :py:class:`Property` 들의 visibility 를 제어한다.
 
@@ -88,13 +137,24 @@ class Context(Type.Options):
     _cs_codecs_ = {}
     _cm_codecs_ = None
     _explicit_ = True
+    _optimistic_ = True  # False 면 에러를 추적하며 실행하는 중이다.
+    _speculative_ = False  # True 면 에러를 추적하지 않고 실행하는 중이다. 실패하면 바깥에서 다시 실행해준다.
     view = None
     strict = False
     max_errors = 1
+    optimistic = True
+    lazy = False
+    shared = False
 
     def __init__(self, **kwargs):
         super(Context, self).__init__(**kwargs)
         self._compile_set('view')
+        if not self.optimistic:
+            self._optimistic_ = False
+        if self.shared:
+            self._thread = threading.local()
+            # 스레드별 인스턴스들이 같은 dict 를 참조해서, 나중에 등록한 코덱도 공유되도록 한다.
+            self._cm_codecs_ = {}
         self.reset()
 
     def __repr__(self):
@@ -106,7 +166,11 @@ class Context(Type.Options):
 
     @classmethod
     def set_global_codec(cls, name, codec):
-        cls._cs_codecs_[name] = codec
+        # 읽는 쪽이 잠금 없이 사용할 수 있도록 새 dict 로 교체한다.
+        with _schema_lock:
+            codecs = dict(Context._cs_codecs_)
+            codecs[name] = codec
+            Context._cs_codecs_ = codecs
 
     @classmethod
     def get_global_codec(cls, name):
@@ -141,6 +205,9 @@ class Context(Type.Options):
 
         Since version 1.0.
         """
+        if self.shared:
+            self._local_().reset()
+            return
         self._markers = set()
         self._errtree = None
         self._errcnt = 0
@@ -184,6 +251,8 @@ class Context(Type.Options):
 
         Since version 1.0.
         """
+        if self.shared:
+            return self._local_().errors
         if self._errors is None:
             if self._errtree is not None:
                 def walk(node):
@@ -206,12 +275,63 @@ class Context(Type.Options):
         raise TypeError("context got an unexpected option '%s'" % key)
 
     def copy(self):
+        context = self._local_()
         ctx = Context()
-        ctx.__dict__.update(self.__dict__)
+        ctx.__dict__.update(context.__dict__)
+        if self.shared:
+            # 복사본에 등록하는 코덱이 공유되지 않도록 한다.
+            ctx._cm_codecs_ = dict(self._cm_codecs_)
         ctx.reset()
-        ctx._markers = self._markers.copy()
+        ctx._markers = context._markers.copy()
         return ctx
 
+    def _local_(self):
+        # 진행 상태를 담을 인스턴스. shared 면 옵션을 복사한 스레드별 인스턴스를 만들어 둔다.
+        if not self.shared:
+            return self
+        thread = self._thread
+        try:
+            return thread.context
+        except AttributeError:
+            ctx = Context()
+            ctx.__dict__.update(self.__dict__)
+            ctx.shared = False
+            del ctx._thread
+            ctx.reset()
+            thread.context = ctx
+            return ctx
+
+    def _speculate_(self, value, speculative, tracked):
+        # 에러를 추적하지 않는 speculative 로 value 를 처리한다.
+        # 실패하면 에러 정보를 되돌리고, 에러를 추적하는 tracked 로 다시 실행해서 같은 예외와 errors 를 얻는다.
+        # 이미 speculative 로 실행중이면 다시 실행하는 것은 가장 바깥의 몫이다.
+        key = id(value)
+        markers = self._markers
+        if key not in markers:
+            if self._speculative_:
+                markers.add(key)
+                try:
+                    return speculative(value, self)
+                finally:
+                    markers.discard(key)
+            checkpoint = self._errtree, self._errcnt
+            self._speculative_ = True
+            markers.add(key)
+            try:
+                return speculative(value, self)
+            except Exception:
+                self._errtree, self._errcnt = checkpoint
+            finally:
+                self._speculative_ = False
+                markers.discard(key)
+        elif self._speculative_:
+            raise OverflowError()
+        self._optimistic_ = False
+        try:
+            return tracked(value, self)
+        finally:
+            self._optimistic_ = True
+
 
 class Codec(object):
     """
@@ -301,6 +421,45 @@ class JsonCodec(Codec):
         return json.loads(value)
 
 
+_local = threading.local()
+
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+_json_quote = json.encoder.encode_basestring
+_json_decode = json.JSONDecoder().decode
+
+
+def _implicit_context():
+    # context 없이 load 할 때 사용되는, 에러를 추적하지 않는 스레드별 Context.
+    try:
+        return _local.context
+    except AttributeError:
+        context = _local.context = Context()
+        context._explicit_ = False
+        context._speculative_ = True
+        return context
+
+
+def _lazy_context(context):
+    # 미뤄둔 값들을 load 할 때 사용할 Context. 옵션만 물려받는다.
+    ctx = context.copy()
+    ctx._markers = set()
+    ctx._speculative_ = False
+    ctx._optimistic_ = ctx.optimistic
+    return ctx
+
+
+def _call_without_context(func, value):
+    # 에러 정보를 전달할 곳이 없으므로 Context 를 만들지 않고 실행해본다. 실패하면 에러를 추적하며 다시 실행한다.
+    context = _implicit_context()
+    try:
+        return func(value, context)
+    except Exception:
+        context._errtree, context._errcnt = None, 0
+    context = Context(optimistic=False)
+    context._explicit_ = False
+    return func(value, context)
+
+
 class Value(object):
     def __init__(self, value, exc_info):
         self.value = value
@@ -361,6 +520,9 @@ class Marker(object):
     def cursor(self, key, value):
         try:
             yield
+        except GeneratorExit:
+            # 나누어 실행하던 제너레이터가 닫히는 것은 에러가 아니다.
+            raise
         except:
             if self.pending is None:
                 self.pending = OrderedDict()
@@ -381,7 +543,10 @@ class Tuplizer(object):
         self.repeat = repeat
 
     def __call__(self, *args, **kwargs):
-        return Tuple(self.cls(*args, **kwargs), repeat=self.repeat)
+        opts = dict((key, kwargs.pop(key)) for key in self._tuple_options if key in kwargs)
+        return Tuple(self.cls(*args, **kwargs), repeat=self.repeat, **opts)
+
+    _tuple_options = ('batch', 'lazy')  # Tuple 에 전달되는 옵션들
 
 
 class Property(Type):
@@ -511,10 +676,9 @@ class Property(Type):
 
     Since version 1.0.
     """
+    __slots__ = ('_pm_opts_', '_pm_key_', '_pm_order_')
     _ps_count_ = itertools.count()
-    _pm_opts_ = None
-    _pm_key_ = None
-    _pm_order_ = None
+    _ps_accepts_ = None  # _load_ 가 받아들이는 값의 타입들. None 이면 알 수 없다. _load_ 를 정의하는 클래스에서 함께 정의한다.
 
     class MetaOptions(Type.MetaOptions):
         _options = 'Options'  # name of Options class
@@ -560,6 +724,12 @@ class Property(Type):
             xargs.extend(opts)
         return '%s(%s)' % (self.__class__.__name__, ', '.join(args + sorted(xargs)))
 
+    def __getattr__(self, name):
+        # 값이 주어지지 않은 slot 의 기본값
+        if name == '_pm_key_' or name == '_pm_order_':
+            return None
+        raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+
     #
     # ordered property
     #
@@ -599,7 +769,11 @@ class Property(Type):
         Since version 1.0.
         """
         opts = getattr(self, self.MetaOptions._options)(**kwargs)
-        self._pm_opts_.__dict__.update(opts.__dict__)
+        if opts.__dict__:
+            # Options 는 다른 인스턴스들과 공유될 수 있으므로 고치지 않고 새로 만든다.
+            shared = self._pm_opts_
+            self._pm_opts_ = copy.copy(shared)
+            self._pm_opts_.__dict__.update(opts.__dict__)
         if ordered:
             self._pm_order_ = next(self._ps_count_)
         return self
@@ -702,34 +876,154 @@ class Property(Type):
     def dump(self, value, context=None):
         if value is None:
             return None
+        if context is not None and context.shared:
+            context = context._local_()
         value = self._dump_(value, context)
         if context is not None and context._explicit_ and self._pm_opts_.codec is not None:
-            for name_or_codec in self._pm_opts_.codec:
-                if isinstance(name_or_codec, Codec):
-                    codec = name_or_codec
-                else:
-                    codec = context.get_codec(name_or_codec)
-                value = codec.encode(value, self, context)
+            value = self._encode(value, context)
         return value
 
+    def _encode(self, value, context):
+        for name_or_codec in self._pm_opts_.codec:
+            if isinstance(name_or_codec, Codec):
+                codec = name_or_codec
+            else:
+                codec = context.get_codec(name_or_codec)
+            value = codec.encode(value, self, context)
+        return value
+
+    def _decode(self, value, context):
+        for name_or_codec in reversed(self._pm_opts_.codec):
+            if isinstance(name_or_codec, Codec):
+                codec = name_or_codec
+            else:
+                codec = context.get_codec(name_or_codec)
+            value = codec.decode(value, self, context)
+        return value
+
+    def aload(self, value, context=None, budget_ms=5):
+        """
+        :py:meth:`Property.load` 와 같은 일을 하는 awaitable 을 돌려준다. ``await`` 하면 결과를 얻는다.
+
+        :py:class:`Entity` 와 :py:class:`Tuple` 의 원소들을 하나씩 처리하면서, ``budget_ms`` 밀리초가 지날 때마다 asyncio 이벤트 루프에 양보한다.
+        큰 값을 load 하는 동안에도 같은 이벤트 루프에서 처리되는 다른 작업들의 지연 시간이 늘어나지 않는다.
+        작은 원소들은 나누지 않고 :py:meth:`Property.load` 로 한 번에 처리한다.
+
+        결과와 예외, ``context`` 의 ``errors`` 는 :py:meth:`Property.load` 와 같다. 진행 상태는 호출마다 따로 관리되기 때문에,
+        여러 태스크가 하나의 ``context`` 를 함께 사용할 수 있다. 이 경우 ``errors`` 는 마지막으로 실패한 호출의 것이다.
+
+        Since version 1.1.
+        """
+        return _Cooperative(self, value, context, False, budget_ms)
+
+    def adump(self, value, context=None, budget_ms=5):
+        """
+        :py:meth:`Property.dump` 와 같은 일을 하는 awaitable 을 돌려준다.
+
+        이벤트 루프에 양보하는 방식은 :py:meth:`Property.aload` 와 같다.
+
+        Since version 1.1.
+        """
+        return _Cooperative(self, value, context, True, budget_ms)
+
+    def load_many(self, values, context=None, workers=None, chunksize=256):
+        """
+        ``values`` 의 값들을 여러 프로세스에 나누어 :py:meth:`Property.load` 한 결과의 :py:class:`list` 를 입력 순서대로 돌려준다.
+
+        ``workers`` 개의 프로세스를 갖는 :py:class:`concurrent.futures.ProcessPoolExecutor` 를 사용하고, 기본값은 CPU 의 수다.
+        값들은 ``chunksize`` 개씩 묶어서 전달되는데, ``self`` 는 한 번만 pickle 해서 묶음마다 함께 전달하고 각 프로세스는 처음 받을 때만 복원한다.
+        ``workers`` 가 1 이거나 묶음이 하나뿐이거나 :py:mod:`concurrent.futures` 가 없으면 (Python 2) 현재 프로세스에서 처리한다.
+        ``self`` 와 값들, 결과는 pickle 할 수 있어야 한다. 즉 :py:class:`Entity` 는 모듈 수준에서 정의되어야 한다.
+
+        ``context`` 의 옵션들과 :py:meth:`Context.set_codec` 으로 등록한 코덱들이 모든 값에 적용된다. 코덱도 pickle 할 수 있어야 한다.
+
+        에러가 발생해도 나머지 값들은 처리한다. ``context`` 를 제공하면 예외를 일으키지 않고 결과를 돌려주는데, 에러가 발생한 값의 자리는
+        None 이고, ``context`` 의 ``errors`` 로 ``/3/name`` 처럼 인덱스를 포함한 위치가 제공된다 (``max_errors`` 개의 값까지).
+        ``ValueError`` 가 아닌 예외도 같은 방식으로 보고된다. ``context`` 를 제공하지 않으면 첫 에러의 위치를 담은 :py:exc:`ValueError`
+        예외를 일으킨다.
+
+        Since version 1.1.
+        """
+        return _map_many(self, 'load', values, context, workers, chunksize)
+
+    def dump_many(self, values, context=None, workers=None, chunksize=256):
+        """
+        ``values`` 의 값들을 여러 프로세스에 나누어 :py:meth:`Property.dump` 한 결과의 :py:class:`list` 를 입력 순서대로 돌려준다.
+
+        옵션과 에러 처리는 :py:meth:`Property.load_many` 와 같다.
+
+        Since version 1.1.
+        """
+        return _map_many(self, 'dump', values, context, workers, chunksize)
+
+    def dumps(self, value, context=None):
+        """
+        값을 :py:meth:`Property.dump` 한 결과를 JSON 텍스트로 돌려준다.
+
+        공백 없는 형식을 사용하고, ASCII 가 아닌 문자를 이스케이프하지 않는다.
+
+        Since version 1.1.
+        """
+        return _json_encode(self.dump(value, context))
+
+    def loads(self, text, context=None):
+        """
+        JSON 텍스트를 해석한 값을 :py:meth:`Property.load` 한 결과를 돌려준다.
+
+        ``text`` 로는 :py:class:`str` 이나 UTF-8 로 인코딩된 :py:class:`bytes` 를 제공한다.
+        JSON 문법 오류는 :py:exc:`ValueError` 예외를 일으킨다.
+
+        Since version 1.1.
+        """
+        if not isinstance(text, unicode_type):
+            text = text.decode('utf-8')
+        return self.load(_json_decode(text), context)
+
     def load(self, value, context=None):
+        if context is None:
+            return _call_without_context(self._load, value)
+        if context.shared:
+            context = context._local_()
+        if context._speculative_:
+            return self._load(value, context)
         with Marker(context, value, check=False) as marker:
-            if value is None:
-                if self._pm_opts_.required:
-                    raise ValueError()
-                return None
-            if context is not None and context._explicit_ and self._pm_opts_.codec is not None:
-                for name_or_codec in reversed(self._pm_opts_.codec):
-                    if isinstance(name_or_codec, Codec):
-                        codec = name_or_codec
-                    else:
-                        codec = marker.context.get_codec(name_or_codec)
-                    value = codec.decode(value, self, marker.context)
-            value = self._load_(value, marker.context)
+            return self._load(value, marker.context)
+
+    def _load(self, value, context):
+        if value is None:
+            if self._pm_opts_.required:
+                raise ValueError()
+            return None
+        if context._explicit_ and self._pm_opts_.codec is not None:
+            value = self._decode(value, context)
+        value = self._load_(value, context)
+        if self._pm_opts_.validate is not None:
+            if not self._pm_opts_.validate(value):
+                raise ValueError()
+        return value
+
+    def _load_all_(self, values, context):
+        # 같은 Property 로 구성된 Tuple 의 값들을 load 한다. 한 번에 처리할 수 있는 Property 는 재정의한다.
+        return [self.load(value, context) for value in values]
+
+    def _load_steps(self, value, context, steps):
+        # steps 로 _load_ 를 나누어 실행하는 load. value 는 None 이 아니고 context 는 에러를 추적한다.
+        with Marker(context, value, check=False) as marker:
+            context = marker.context
+            if context._explicit_ and self._pm_opts_.codec is not None:
+                value = self._decode(value, context)
+            value = yield steps(self, value, context)
             if self._pm_opts_.validate is not None:
                 if not self._pm_opts_.validate(value):
                     raise ValueError()
-            return value
+        yield _Result(value)
+
+    def _dump_steps(self, value, context, steps):
+        # steps 로 _dump_ 를 나누어 실행하는 dump.
+        value = yield steps(self, value, context)
+        if context._explicit_ and self._pm_opts_.codec is not None:
+            value = self._encode(value, context)
+        yield _Result(value)
 
     #
     # visibility control
@@ -804,14 +1098,31 @@ class Proxy(Property):
         else:
             return self.factory.frame.f_locals.get(self.factory.klass.__name__)
 
+    def _resolved(self):
+        # 이미 해석되었다면 owner 가 해석된 Property 를 갖고 있다.
+        fields = getattr(self.owner, '_cs_fields_', None) or getattr(self.owner, '_cm_args_', None)
+        if fields is not None:
+            property = fields[self._pm_key_]
+            if not isinstance(property, Proxy):
+                return property
+        return None
+
     def resolve(self):
-        klass = self._resolve()
-        if klass is not self.factory and issubclass(klass, Property):
-            if self.owner is not None:
-                property = klass(*self.args, **self.kwargs)
-                self.owner._resolve_(self._pm_key_, property)
-                property._bind_(self._pm_key_, self.owner)
+        property = self._resolved()
+        if property is not None:
+            return property
+        with _schema_lock:
+            # 다른 스레드가 먼저 해석했을 수 있다.
+            property = self._resolved()
+            if property is not None:
                 return property
+            klass = self._resolve()
+            if klass is not self.factory and issubclass(klass, Property):
+                if self.owner is not None:
+                    property = klass(*self.args, **self.kwargs)
+                    self.owner._resolve_(self._pm_key_, property)
+                    property._bind_(self._pm_key_, self.owner)
+                    return property
         raise ReferenceError('unresolved class %s.%s' % (self.factory.klass.__module__, self.factory.klass.__name__))
 
     def __set__(self, instance, value):
@@ -831,6 +1142,10 @@ class Proxy(Property):
         self.owner = owner
         self.kwargs.update(self._pm_opts_.__dict__)
 
+    def __reduce__(self):
+        # factory 는 frame 을 참조하기 때문에 pickle 할 수 없다. 해석된 Property 를 pickle 한다.
+        return self.resolve().__reduce_ex__(2)
+
 
 def declare(property):
     class Factory(object):
@@ -878,9 +1193,29 @@ class Tuple(Container):
 
         기본 값은 1.
 
+    batch
+        True 면 :py:class:`tuple` 대신 :py:class:`EntityBatch` 로 load 한다. ``properties`` 로 하나의 :py:class:`Entity` 만 제공해야 한다.
+
+        기본 값은 False.
+
+        Since version 1.1.
+
+    lazy
+        True 면 :py:class:`tuple` 대신 변경할 수 없는 :py:class:`Sequence` 로 load 한다. 형과 길이, ``repeat`` 는 load 할 때 검사하지만,
+        원소들은 인덱싱이나 이터레이션으로 처음 읽힐 때 load 하고 결과를 보관한다. 아주 큰 배열의 일부만 사용하는 경우 변환 비용을 줄일 수 있다.
+
+        원소의 에러는 원소를 읽을 때 발견되고, 위치를 담은 :py:exc:`ValueError` 예외를 일으킨다. ``batch`` 와 함께 사용할 수 없다.
+
+        :py:class:`tuple` 은 그대로 보관하지만, :py:class:`list` 같은 다른 시퀀스는 load 할 때 :py:class:`tuple` 로 복사해서 보관한다.
+        나중에 입력을 수정해도 아직 읽지 않은 원소가 바뀌지 않도록 하기 위해서다. 원소들은 복사하지 않는다.
+
+        기본 값은 False.
+
+        Since version 1.1.
+
     모든 :py:class:`Property` 는 클래스에 ``[]`` 연산자를 적용해서 고정 혹은 가변 길이 homogeneous :py:class:`Tuple` 로 변환할 수 있다.
     ``P[...]()`` 은 ``Tuple(P(), repeat=...)`` 과 같은 표현이다. 이 표현의 장점은 :py:class:`slice` 를 간편하게 제공할 수 있다는 것이고,
-    단점은 ``repeat`` 외에는 :py:class:`Tuple` 에 제공할 옵션을 지정할 수 없다는 것이다.
+    단점은 ``repeat``, ``batch``, ``lazy`` 외에는 :py:class:`Tuple` 에 제공할 옵션을 지정할 수 없다는 것이다.
     필요할 경우는 :py:meth:`Property.apply_options` 를 사용할 수 있는데, :py:class:`Tuple` 을 직접적으로 사용하는 것이 분명할 경우가 많다.
 
 
@@ -890,12 +1225,17 @@ class Tuple(Container):
 
     Since version 1.0.
     """
+    _ps_accepts_ = (tuple, list, Sequence)  # Sequence 는 _LazyTuple
 
     class Options(Container.Options):
         repeat = None
+        batch = False
+        lazy = False
 
         def __init__(self, **kwargs):
             super(Tuple.Options, self).__init__(**kwargs)
+            if self.batch and self.lazy:
+                raise TypeError('batch and lazy options are exclusive')
             repeat = self.repeat
             if repeat is not None:
                 self.repeat = self._normalize_repeat(self.repeat)
@@ -925,6 +1265,13 @@ class Tuple(Container):
                 return frozenset(repeat)
 
     def _dump_(self, value, context):
+        if context is None:
+            return _call_without_context(self._dump_, value)
+        if context._optimistic_:
+            return context._speculate_(value, self._dump_untracked, self._dump_)
+        return _drive(self._dump_steps_(value, context), True)
+
+    def _dump_steps_(self, value, context):
         with Marker(context, value) as marker:
             spec = self.get_components()
             unit = len(spec)
@@ -935,10 +1282,28 @@ class Tuple(Container):
                     j = i % unit
                     if visible[j]:
                         property = spec[j]
-                        encoded.append(property.dump(val, marker.context))
+                        encoded.append((yield (property, val, marker.context)))
                     else:
                         encoded.append(None)
-            return encoded
+        yield _Result(encoded)
+
+    def _dump_untracked(self, value, context):
+        spec = self.get_components()
+        if len(spec) == 1:
+            property = spec[0]
+            if property._isvisible_(context):
+                return [property.dump(val, context) for val in value]
+            return [None] * len(value)
+        unit = len(spec)
+        visible = [p._isvisible_(context) for p in spec]
+        encoded = []
+        for i, val in enumerate(value):
+            j = i % unit
+            if visible[j]:
+                encoded.append(spec[j].dump(val, context))
+            else:
+                encoded.append(None)
+        return encoded
 
     def _check_length_(self, value, repeat):
         unit = len(self.get_components())
@@ -965,35 +1330,439 @@ class Tuple(Container):
         return n
 
     def _load_(self, value, context):
+        if context is not None and context._optimistic_:
+            return context._speculate_(value, self._load_untracked, self._load_)
+        return _drive(self._load_steps_(value, context))
+
+    def _load_steps_(self, value, context):
         with Marker(context, value) as marker:
+            batch = self._pm_opts_.batch
             if not isinstance(value, (tuple, list)):
-                raise ValueError()
-            n = self._check_length_(value, self._pm_opts_.repeat)
-            if n == 0:
-                return tuple(value)
-            decoded = []
+                if batch:
+                    decoded = self._batch_(value)
+                elif isinstance(value, _LazyTuple):
+                    decoded = self._lazy_(value, marker.context)
+                else:
+                    raise ValueError()
+            elif self._check_length_(value, self._pm_opts_.repeat) == 0 and not batch:
+                decoded = tuple(value)
+            elif self._pm_opts_.lazy:
+                decoded = _LazyTuple(self, value, marker.context)
+            else:
+                decoded = self._batch_() if batch else []
+                spec = self.get_components()
+                unit = len(spec)
+                visible = [p._isvisible_(marker.context) for p in spec]
+                for i, val in enumerate(value):
+                    with marker.cursor(i, val):
+                        j = i % unit
+                        if visible[j]:
+                            property = spec[j]
+                            if val is None:
+                                default = property._pm_opts_.default
+                                if default is not None:
+                                    if callable(default):
+                                        default = default()
+                                    val = default
+                            decoded.append((yield (property, val, marker.context)))
+                        else:
+                            if val is not None:
+                                raise ValueError()
+                            decoded.append(None)
+                if not batch:
+                    decoded = tuple(decoded)
+        yield _Result(decoded)
+
+    def _load_untracked(self, value, context):
+        batch = self._pm_opts_.batch
+        if not isinstance(value, (tuple, list)):
+            if batch:
+                return self._batch_(value)
+            if isinstance(value, _LazyTuple):
+                return self._lazy_(value, context)
+            raise ValueError()
+        n = self._check_length_(value, self._pm_opts_.repeat)
+        if n == 0 and not batch:
+            return tuple(value)
+        if self._pm_opts_.lazy:
+            return _LazyTuple(self, value, context)
+        spec = self.get_components()
+        if len(spec) == 1:
+            property = spec[0]
+            if property._isvisible_(context) and property._pm_opts_.default is None:
+                if batch:
+                    decoded = self._batch_()
+                    decoded.extend(property._load_all_(value, context))
+                    return decoded
+                return tuple(property._load_all_(value, context))
+        unit = len(spec)
+        visible = [p._isvisible_(context) for p in spec]
+        decoded = self._batch_() if batch else []
+        for i, val in enumerate(value):
+            j = i % unit
+            if visible[j]:
+                property = spec[j]
+                if val is None:
+                    default = property._pm_opts_.default
+                    if default is not None:
+                        if callable(default):
+                            default = default()
+                        val = default
+                decoded.append(property.load(val, context))
+            else:
+                if val is not None:
+                    raise ValueError()
+                decoded.append(None)
+        return decoded if batch else tuple(decoded)
 
-            spec = self.get_components()
-            unit = len(spec)
-            visible = [p._isvisible_(marker.context) for p in spec]
-            for i, val in enumerate(value):
-                with marker.cursor(i, val):
-                    j = i % unit
-                    if visible[j]:
-                        property = spec[j]
-                        if val is None:
-                            default = property._pm_opts_.default
-                            if default is not None:
-                                if callable(default):
-                                    default = default()
-                                val = default
-                        decoded.append(property.load(val, marker.context))
-                    else:
-                        if val is not None:
-                            raise ValueError()
-                        decoded.append(None)
-            return tuple(decoded)
+    def _lazy_(self, value, context):
+        # 다른 _LazyTuple 은 원소들을 모두 읽어서 다시 load 한다.
+        if value._property is self:
+            return value
+        return self._load_(tuple(value), context)
+
+    def _batch_(self, value=None):
+        spec = self.get_components()
+        if len(spec) != 1 or not hasattr(spec[0], '_load_batch_'):
+            raise TypeError('batch option requires an Entity')
+        return spec[0]._load_batch_(value)
+
+
+class _Result(object):
+    # 나누어 실행하는 제너레이터가 마지막으로 yield 하는 결과.
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _drive(steps, dump=False):
+    # 에러를 추적하는 _load_ 와 _dump_ 는 제너레이터로 작성된다. 자식 값의 처리는 (property, value, context) 를 yield 해서 요청하고,
+    # 다른 제너레이터를 yield 하면 그 결과를 받는다. 결과는 _Result 로 제공한다. 여기에서는 모두 그 자리에서 실행한다.
+    item = next(steps)
+    while type(item) is not _Result:
+        try:
+            if type(item) is tuple:
+                property, value, context = item
+                value = property.dump(value, context) if dump else property.load(value, context)
+            else:
+                value = _drive(item, dump)
+        except Exception as e:
+            item = steps.throw(e)
+        else:
+            item = steps.send(value)
+    return item.value
+
+
+def _steps_of(property, name):
+    # name ('_load_' 나 '_dump_') 을 나누어 실행하는 제너레이터 메쏘드. name 을 재정의한 클래스는 그대로 실행한다.
+    for klass in type(property).__mro__:
+        if name in klass.__dict__:
+            return klass.__dict__.get(name[:-1] + '_steps_')
+    return None
+
+
+def _is_small(value, limit):
+    # value 를 이루는 원소의 수가 limit 이하면 True. 이런 값은 나누지 않고 한 번에 처리한다.
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (list, tuple)):
+            limit -= len(value)
+            if limit < 0:
+                return False
+            pending.extend(value)
+        elif isinstance(value, dict):
+            limit -= len(value)
+            if limit < 0:
+                return False
+            pending.extend(value.values())
+        else:
+            data = getattr(value, '_em_data_', None)
+            if data is not None:
+                if type(data) is not dict:
+                    return False
+                limit -= len(data)
+                if limit < 0:
+                    return False
+                pending.extend(data.values())
+            elif isinstance(value, Sequence):
+                limit -= len(value)
+                if limit < 0:
+                    return False
+    return True
+
+
+class _Cooperative(object):
+    # aload 와 adump 가 돌려주는 awaitable. _drive 처럼 제너레이터들을 실행하되, 큰 값은 스택에 쌓아서 나누어 실행하고
+    # budget 이 지나면 이벤트 루프에 양보한다. asyncio 의 태스크는 None 을 받으면 이벤트 루프를 한 바퀴 돈 후에 다시 실행한다.
+    # Python 2 에서도 import 할 수 있도록 제너레이터 대신 이터레이터 프로토콜을 직접 구현한다.
+    _split = 256  # 원소의 수가 이보다 많은 값을 나누어 실행한다.
+
+    def __init__(self, property, value, context, dump, budget_ms):
+        if context is None:
+            self._target = None
+            context = Context()
+            context._explicit_ = False
+        else:
+            self._target = context._local_()
+            context = _lazy_context(self._target)
+        self._context = context
+        self._dump = dump
+        self._budget = budget_ms / 1000.0
+        self._stack = []
+        self._item, self._value, self._exc = (property, value, context), None, None
+
+    def __await__(self):
+        return self
+
+    __iter__ = __await__
+
+    def __next__(self):
+        return self.send(None)
+
+    next = __next__
+
+    def send(self, ignored):
+        stack = self._stack
+        item, value, exc = self._item, self._value, self._exc
+        deadline = default_timer() + self._budget
+        while True:
+            if item is None:
+                # 스택의 맨 위에 직전의 결과나 예외를 전달한다.
+                try:
+                    item = stack[-1].send(value) if exc is None else stack[-1].throw(exc)
+                except Exception as e:
+                    stack.pop()
+                    if not stack:
+                        self._fail()
+                        raise
+                    value, exc = None, e
+                    continue
+                value = exc = None
+            if type(item) is _Result:
+                stack.pop()
+                value = item.value
+            elif type(item) is tuple:
+                property, val, context = item
+                steps = self._steps(property, val, context)
+                if steps is None:
+                    try:
+                        value = property.dump(val, context) if self._dump else property.load(val, context)
+                    except Exception as e:
+                        exc = e
+                else:
+                    stack.append(steps)
+            else:
+                stack.append(item)
+            item = None
+            if not stack:
+                if exc is not None:
+                    self._fail()
+                    raise exc
+                raise StopIteration(value)
+            if default_timer() >= deadline:
+                self._item, self._value, self._exc = item, value, exc
+                return None
 
+    def throw(self, typ, val=None, tb=None):
+        # 태스크가 취소되면 진행중이던 제너레이터들을 닫는다.
+        self.close()
+        if val is None:
+            val = typ() if isinstance(typ, type) else typ
+        raise val
+
+    def close(self):
+        while self._stack:
+            self._stack.pop().close()
+
+    def _steps(self, property, value, context):
+        # 나누어 실행할 제너레이터. 나눌 필요가 없으면 None.
+        if value is None or _is_small(value, self._split):
+            return None
+        if isinstance(property, Proxy):
+            property = property.resolve()
+        if self._dump:
+            steps = _steps_of(property, '_dump_')
+            return None if steps is None else property._dump_steps(value, context, steps)
+        steps = _steps_of(property, '_load_')
+        return None if steps is None else property._load_steps(value, context, steps)
+
+    def _fail(self):
+        # 에러 정보를 호출한 쪽의 Context 로 옮긴다.
+        if self._target is not None:
+            context = self._context
+            self._target._errtree, self._target._errcnt, self._target._errors = \
+                context._errtree, context._errcnt, context._errors
+
+
+class _ManyWorker(object):
+    # load_many 와 dump_many 에서 값들의 묶음을 처리한다. 프로세스마다 한 번 만든다.
+
+    def __init__(self, property, method, options, codecs):
+        self.method = getattr(property, method)
+        if options is None:
+            self.context = Context()
+            self.context._explicit_ = False
+        else:
+            self.context = Context(**options)
+        for name, codec in codecs.items():
+            self.context.set_codec(name, codec)
+
+    def __call__(self, values):
+        method, context = self.method, self.context
+        results = []
+        failures = []
+        for i, value in enumerate(values):
+            try:
+                results.append(method(value, context))
+            except Exception as e:
+                tree = context._errtree
+                if tree is None:
+                    tree = Value(value, (type(e), e, None))
+                failures.append((i, _picklable_errtree(tree)))
+                results.append(None)
+                context.reset()
+        return results, failures
+
+
+def _picklable_errtree(node):
+    # traceback 은 pickle 할 수 없기 때문에 버린다.
+    if isinstance(node, Value):
+        exc_info = node.exc_info
+        return Value(node.value, None if exc_info is None else (exc_info[0], exc_info[1], None))
+    return OrderedDict((key, _picklable_errtree(val)) for key, val in node.items())
+
+
+_many_worker = None  # (setup, _ManyWorker)
+
+
+def _run_many_worker(args):
+    # 묶음과 함께 pickle 한 설정을 받는다. _ManyWorker 는 프로세스마다 설정이 바뀔 때만 만든다.
+    global _many_worker
+    setup, values = args
+    if _many_worker is None or _many_worker[0] != setup:
+        _many_worker = (setup, _ManyWorker(*pickle.loads(setup)))
+    return _many_worker[1](values)
+
+
+def _map_many(property, method, values, context, workers, chunksize):
+    values = list(values)
+    if context is None:
+        options, codecs = None, {}
+    else:
+        options = dict((key, val) for key, val in context.__dict__.items() if not key.startswith('_'))
+        options.pop('shared', None)
+        codecs = dict(context._local_()._cm_codecs_ or {})
+    chunks = [values[i:i + chunksize] for i in range(0, len(values), chunksize)]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    executor = None
+    if workers > 1 and len(chunks) > 1:
+        try:
+            executor = futures.ProcessPoolExecutor(min(workers, len(chunks)))
+        except ImportError:
+            # concurrent.futures 가 없으면 (Python 2) 현재 프로세스에서 처리한다.
+            pass
+    if executor is None:
+        worker = _ManyWorker(property, method, options, codecs)
+        outputs = [worker(chunk) for chunk in chunks]
+    else:
+        setup = pickle.dumps((property, method, options, codecs), pickle.HIGHEST_PROTOCOL)
+        with executor:
+            outputs = list(executor.map(_run_many_worker, [(setup, chunk) for chunk in chunks]))
+    results = []
+    errtree = OrderedDict()
+    for n, (chunk, failures) in enumerate(outputs):
+        results.extend(chunk)
+        for i, tree in failures:
+            errtree[n * chunksize + i] = tree
+    if errtree:
+        local = Context() if context is None else context._local_()
+        local._errtree = OrderedDict(list(errtree.items())[:local.max_errors])
+        local._errcnt = len(local._errtree)
+        if context is None:
+            raise ValueError(local.errors[0].location)
+    return results
+
+
+class _LazyTuple(Sequence):
+    # Tuple 의 lazy 옵션으로 load 한 값. 원소들은 처음 읽힐 때 load 한다.
+    __slots__ = ('_property', '_value', '_context', '_visible', '_decoded')
+
+    def __init__(self, property, value, context):
+        self._property = property
+        # 입력 리스트가 나중에 바뀌어도 영향을 받지 않도록 복사한다. tuple 은 바뀌지 않으므로 그대로 사용한다.
+        self._value = value if type(value) is tuple else tuple(value)
+        self._context = _lazy_context(context)
+        self._visible = [p._isvisible_(context) for p in property.get_components()]
+        self._decoded = None
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+    def __len__(self):
+        return len(self._value)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self._value))))
+        if index < 0:
+            index += len(self._value)
+        if not 0 <= index < len(self._value):
+            raise IndexError('tuple index out of range')
+        decoded = self._decoded
+        if decoded is None:
+            decoded = self._decoded = [_missing] * len(self._value)
+        value = decoded[index]
+        if value is _missing:
+            value = decoded[index] = self._load(index)
+        return value
+
+    def __iter__(self):
+        for i in range(len(self._value)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (tuple, _LazyTuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return tuple, (tuple(self),)
+
+    def _load(self, i):
+        spec = self._property.get_components()
+        j = i % len(spec)
+        val = self._value[i]
+        context = self._context
+        try:
+            if not self._visible[j]:
+                if val is not None:
+                    raise ValueError()
+                return None
+            property = spec[j]
+            if val is None:
+                default = property._pm_opts_.default
+                if default is not None:
+                    if callable(default):
+                        default = default()
+                    val = default
+            return property.load(val, context)
+        except ValueError:
+            errors = context.errors
+            context.reset()
+            raise ValueError('/%d%s' % (i, errors[0].location if errors else ''))
+
+
+_missing = object()
 
 __all__ = [
     'Null',
@@ -9,6 +9,7 @@ import cmath
 import datetime
 import decimal
 import math
+import operator
 import time
 import uuid
 
@@ -43,6 +44,7 @@ class Primitive(Property):
 
     Since version 1.0.
     """
+    _ps_accepts_ = basestring_types + integer_types + (float, dict, tuple, list)
 
     def _dump_(self, value, context):
         return value
@@ -62,6 +64,8 @@ class Primitive(Property):
             raise ValueError()
 
     def _check_object(self, value, context):
+        if context is not None and context._optimistic_:
+            return context._speculate_(value, self._check_object_untracked, self._check_object)
         with Marker(context, value) as marker:
             for key, val in value.items():
                 skip = False
@@ -76,12 +80,28 @@ class Primitive(Property):
                         self._check_json(val, marker.context)
 
     def _check_array(self, value, context):
+        if context is not None and context._optimistic_:
+            return context._speculate_(value, self._check_array_untracked, self._check_array)
         with Marker(context, value) as marker:
             for i, val in enumerate(value):
                 with marker.cursor(i, val):
                     if not marker.isvisited(val):
                         self._check_json(val, marker.context)
 
+    def _check_object_untracked(self, value, context):
+        markers = context._markers
+        for key, val in value.items():
+            if not isinstance(key, basestring_types):
+                raise ValueError()
+            if id(val) not in markers:
+                self._check_json(val, context)
+
+    def _check_array_untracked(self, value, context):
+        markers = context._markers
+        for val in value:
+            if id(val) not in markers:
+                self._check_json(val, context)
+
 
 class String(Primitive):
     """
@@ -102,6 +122,7 @@ class String(Primitive):
 
     Since version 1.0.
     """
+    _ps_accepts_ = basestring_types
 
     class Options(Primitive.Options):
         allow_empty = True
@@ -135,6 +156,7 @@ class Unicode(String):
 
     Since version 1.0.
     """
+    _ps_accepts_ = (bytes_type, unicode_type)
 
     class Options(String.Options):
         default_encoding = 'utf-8'
@@ -170,6 +192,7 @@ class Bytes(String):
 
     Since version 1.0.
     """
+    _ps_accepts_ = (bytes_type, unicode_type)
 
     class Options(String.Options):
         default_encoding = 'utf-8'
@@ -198,6 +221,7 @@ class Boolean(Primitive):
 
     Since version 1.0.
     """
+    _ps_accepts_ = (bool,)
 
     def _load_(self, value, context):
         if not isinstance(value, bool):
@@ -238,6 +262,7 @@ class Number(Primitive):
 
     Since version 1.0.
     """
+    _ps_accepts_ = integer_types + (float,)
 
     class Options(Primitive.Options):
         allow_bool = False  # 기본 설정은 Python 보다는 JSON 의 convention 을 따른다.
@@ -278,6 +303,7 @@ class Integer(Number):
 
     Since version 1.0.
     """
+    _ps_accepts_ = integer_types + (float,)
 
     def _load_(self, value, context):
         value = super(Integer, self)._load_(value, context)
@@ -303,6 +329,7 @@ class Float(Number):
 
     Since version 1.0.
     """
+    _ps_accepts_ = integer_types + (float,)
 
     def _dump_(self, value, context):
         return value
@@ -327,6 +354,7 @@ class JsonObject(Primitive):
 
     Since version 1.0.
     """
+    _ps_accepts_ = (dict,)
 
     def _load_(self, value, context):
         if not isinstance(value, dict):
@@ -351,6 +379,7 @@ class JsonArray(Primitive):
 
     Since version 1.0.
     """
+    _ps_accepts_ = (list, tuple)
 
     def _load_(self, value, context):
         if not isinstance(value, (list, tuple)):
@@ -385,6 +414,7 @@ class Decimal(Property):
 
     Since version 1.0.
     """
+    _ps_accepts_ = text_types + integer_types + (float, decimal.Decimal)
 
     class Options(Property.Options):
         allow_nan = False
@@ -443,6 +473,7 @@ class Complex(Property):
 
     Since version 1.0.
     """
+    _ps_accepts_ = integer_types + (float, complex, tuple, list)
 
     class Options(Property.Options):
         allow_nan = False
@@ -484,6 +515,7 @@ class Uuid(Property):
 
     Since version 1.0.
     """
+    _ps_accepts_ = basestring_types + (uuid.UUID,)
 
     def _dump_(self, value, context):
         return str(value)
@@ -570,6 +602,37 @@ class DateTimeFormat(object):
         """
         raise NotImplementedError()
 
+    def parse_many(self, values, property, context):
+        """
+        여러 값들을 한 번에 :py:meth:`DateTimeFormat.parse` 한다.
+
+        :py:class:`DateTime` 등으로 구성된 :py:class:`Tuple` 을 :py:meth:`Entity.load` 할 때 사용된다.
+        ``values`` 로는 문자열들의 :py:class:`list` 나 :py:class:`tuple` 이 전달되고, 같은 순서로 변환한 값들의 :py:class:`list` 를 돌려준다.
+
+        기본 구현은 :py:meth:`DateTimeFormat.parse` 를 차례로 호출한다. 더 빠르게 처리할 수 있는 형식은 재정의한다.
+
+        Since version 1.1.
+        """
+        return [self.parse(value, property, context) for value in values]
+
+
+_timezones = {}
+
+
+def _fixed_timezone(offset):
+    # 분 단위 offset 의 timezone. 같은 offset 은 같은 인스턴스를 공유한다.
+    tz = _timezones.get(offset)
+    if tz is None:
+        tz = _timezones[offset] = timezone(datetime.timedelta(minutes=offset))
+    return tz
+
+
+try:
+    _isascii = str.isascii
+except AttributeError:
+    def _isascii(value):
+        return all(ord(c) < 128 for c in value)
+
 
 @DateTimeFormat.register('unix')
 class UnixTimeFormat(DateTimeFormat):
@@ -603,15 +666,15 @@ class UnixTimeFormat(DateTimeFormat):
 
 @DateTimeFormat.register('iso')
 class Iso8601Format(DateTimeFormat):
-    TIME = r'(?P<H>\d{2}):(?P<M>\d{2})(:(?P<S>\d{2}(.\d*)?))?(?P<tzd>[+-](?P<tzh>\d{2}):(?P<tzm>\d{2})|Z)?'
+    TIME = r'(?P<H>\d{2}):(?P<M>\d{2})(:(?P<S>\d{2}(\.\d*)?))?(?P<tzd>[+-](?P<tzh>\d{2}):(?P<tzm>\d{2})|Z)?'
     PATTERN1 = re.compile(r'(?P<Y>\d{4})(-(?P<m>\d{2})(-(?P<d>\d{2})([T ]' + TIME + r')?)?)?')
     PATTERN2 = re.compile(TIME)
 
     def format(self, value, property, context):
         if isinstance(value, (datetime.datetime, datetime.time)):
-            if value.tzinfo and value.utcoffset() == datetime.timedelta():
-                return value.replace(tzinfo=None).isoformat() + 'Z'
-            return value.isoformat()
+            # UTC 와 offset 이 같으면 isoformat 이 +00:00 으로 끝난다.
+            iso = value.isoformat()
+            return iso[:-6] + 'Z' if iso.endswith('+00:00') else iso
         elif isinstance(value, datetime.date):
             return value.isoformat()
         else:
@@ -619,6 +682,9 @@ class Iso8601Format(DateTimeFormat):
 
     def parse(self, value, property, context):
         value = value.strip()
+        parsed = self._parse_canonical(value, property)
+        if parsed is not None:
+            return parsed
         m = self.PATTERN1.match(value)
         if m is None:
             if issubclass(property, Time):
@@ -652,7 +718,7 @@ class Iso8601Format(DateTimeFormat):
                 offset = int(m.group('tzh')) * 60 + int(m.group('tzm'))
                 if m.group('tzd').startswith('-'):
                     offset = -offset
-                tzinfo = timezone(datetime.timedelta(minutes=offset))
+                tzinfo = _fixed_timezone(offset)
             time = time.replace(tzinfo=tzinfo)
 
         if issubclass(property, Time):
@@ -660,12 +726,97 @@ class Iso8601Format(DateTimeFormat):
 
         return datetime.datetime.combine(date, time)
 
+    def parse_many(self, values, property, context):
+        canonical = self._parse_canonical
+        parsed = []
+        append = parsed.append
+        for value in values:
+            decoded = canonical(value.strip(), property)
+            append(self.parse(value, property, context) if decoded is None else decoded)
+        return parsed
+
+    def _parse_canonical(self, value, property):
+        # YYYY-MM-DD[(T| )HH:MM:SS[.ffffff][Z|+HH:MM|-HH:MM]] 과 Time 의 HH:MM:SS[...] 를 정규식 없이 읽는다.
+        # 결과는 정규식을 사용할 때와 같다. 이 형태가 아니면 None 을 돌려준다.
+        n = len(value)
+        if n >= 10 and value[4] == '-' and value[7] == '-' and _isascii(value):
+            if not (value[:4].isdigit() and value[5:7].isdigit() and value[8:10].isdigit()):
+                return None
+            date = datetime.date(int(value[:4]), int(value[5:7]), int(value[8:10]))
+            if issubclass(property, Date):
+                return date
+            if n == 10:
+                time = datetime.time()
+            elif value[10] in 'T ':
+                time = self._parse_time(value, 11)
+                if time is None:
+                    return None
+            else:
+                return None
+            if issubclass(property, Time):
+                return time
+            return datetime.datetime.combine(date, time)
+        if n >= 8 and value[2] == ':' and issubclass(property, Time) and _isascii(value):
+            return self._parse_time(value, 0)
+        return None
+
+    def _parse_time(self, value, i):
+        # value[i:] 가 HH:MM:SS[.ffffff][Z|+HH:MM|-HH:MM] 이면 datetime.time, 아니면 None.
+        n = len(value)
+        if n < i + 8 or value[i + 5] != ':':
+            return None
+        hour, min, sec = value[i:i + 2], value[i + 3:i + 5], value[i + 6:i + 8]
+        if value[i + 2] != ':' or not (hour.isdigit() and min.isdigit() and sec.isdigit()):
+            return None
+        end = n
+        tzinfo = None
+        if value[-1] == 'Z':
+            end -= 1
+            tzinfo = timezone.utc
+        elif n >= i + 14 and value[-6] in '+-' and value[-3] == ':':
+            end -= 6
+            tzh, tzm = value[-5:-3], value[-2:]
+            if not (tzh.isdigit() and tzm.isdigit()):
+                return None
+            offset = int(tzh) * 60 + int(tzm)
+            tzinfo = timezone.utc if offset == 0 else _fixed_timezone(-offset if value[-6] == '-' else offset)
+        if end == i + 8:
+            second, microsecond = int(sec), 0
+        elif value[i + 8] == '.' and (end == i + 9 or value[i + 9:end].isdigit()):
+            # 정규식을 사용할 때처럼 float 로 변환한다.
+            sec = float(value[i + 6:end])
+            second, microsecond = int(sec), int((sec % 1.0) * 1000000)
+        else:
+            return None
+        return datetime.time(int(hour), int(min), second, microsecond, tzinfo)
+
 
 class Rfc2822Format(DateTimeFormat):
     WDAY = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
     MON = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+    CACHE_SIZE = 1024
+
+    def __init__(self, name):
+        super(Rfc2822Format, self).__init__(name)
+        # 헤더에 쓰이는 값들은 같은 초에 몰리는 경우가 많아서 최근 결과를 재사용한다.
+        # 크기가 CACHE_SIZE 에 이르면 비운다.
+        self._formatted = {}
+        self._parsed = {}
 
     def _format(self, value, property, context, gmt):
+        # 초 미만은 출력되지 않는다. 같은 시각이라도 offset 이 다르면 결과가 다르므로 키에 포함한다.
+        if isinstance(value, datetime.datetime) or isinstance(value, datetime.time):
+            key = (value.replace(microsecond=0) if value.microsecond else value, value.utcoffset())
+        else:
+            key = (value, None)
+        text = self._formatted.get(key)
+        if text is None:
+            if len(self._formatted) >= self.CACHE_SIZE:
+                self._formatted.clear()
+            text = self._formatted[key] = self._format_nocache(value, gmt)
+        return text
+
+    def _format_nocache(self, value, gmt):
         if isinstance(value, datetime.time):
             value = datetime.datetime.combine(datetime.date.fromtimestamp(0), value)
         elif not isinstance(value, datetime.datetime):
@@ -681,7 +832,13 @@ class Rfc2822Format(DateTimeFormat):
         return value.strftime(format)
 
     def parse(self, value, property, context):
-        dt = parsedate_to_datetime(value.strip())
+        dt = self._parsed.get(value) if isinstance(value, text_types) else None
+        if dt is None:
+            dt = parsedate_to_datetime(value.strip())
+            if isinstance(value, text_types):
+                if len(self._parsed) >= self.CACHE_SIZE:
+                    self._parsed.clear()
+                self._parsed[value] = dt
         if issubclass(property, Date):
             return dt.date()
         elif issubclass(property, Time):
@@ -701,6 +858,133 @@ class HttpDateFormat(Rfc2822Format):
         return self._format(value, property, context, True)
 
 
+class _StrftimeFormat(object):
+    # DateTimeFormat 으로 등록되지 않은 format. 숫자로 된 지시자들로만 구성되면 한 번 컴파일해서 사용하고,
+    # 아니면 datetime.strptime 과 strftime 을 그대로 사용한다. 정규식은 _strptime 모듈이 만드는 것과 같다.
+    DIRECTIVES = {
+        'd': (r'(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])', 'day', '%02d'),
+        'f': (r'(?P<f>[0-9]{1,6})', 'microsecond', '%06d'),
+        'H': (r'(?P<H>2[0-3]|[0-1]\d|\d)', 'hour', '%02d'),
+        'm': (r'(?P<m>1[0-2]|0[1-9]|[1-9])', 'month', '%02d'),
+        'M': (r'(?P<M>[0-5]\d|\d)', 'minute', '%02d'),
+        'S': (r'(?P<S>6[0-1]|[0-5]\d|\d)', 'second', '%02d'),
+        'y': (r'(?P<y>\d\d)', 'year', '%02d'),
+        'Y': (r'(?P<Y>\d\d\d\d)', 'year', '%04d'),
+    }
+    REGEX_CHARS = re.compile(r'([\\.^$*+?\(\){}\[\]|])')
+    WHITESPACE = re.compile(r'\s+')
+
+    def __init__(self, format):
+        self.format = format
+        self.regex = None
+        tokens = []  # [(지시자, 문자열)], 지시자가 아닌 부분은 지시자가 None
+        i = 0
+        while i < len(format):
+            j = format.find('%', i)
+            if j < 0:
+                tokens.append((None, format[i:]))
+                break
+            tokens.append((None, format[i:j]))
+            directive = format[j + 1:j + 2]
+            if directive == '%':
+                tokens.append((None, '%'))
+            elif directive in self.DIRECTIVES:
+                tokens.append((directive, None))
+            else:
+                return
+            i = j + 2
+        directives = [directive for directive, text in tokens if directive is not None]
+        if len(set(directives)) != len(directives) or 'y' in directives and 'Y' in directives:
+            return
+        regex, template = [], []
+        for directive, text in tokens:
+            if directive is None:
+                regex.append(self.WHITESPACE.sub(r'\\s+', self.REGEX_CHARS.sub(r'\\\1', text)))
+                template.append(text.replace('%', '%%'))
+            else:
+                regex.append(self.DIRECTIVES[directive][0])
+                template.append(self.DIRECTIVES[directive][2])
+        self.regex = re.compile(''.join(regex), re.IGNORECASE)
+        self.groups = [(self.regex.groupindex[d], d) for d in directives]
+        self.template = ''.join(template)
+        self.directives = directives
+        if directives:
+            self.getter = operator.attrgetter(*[self.DIRECTIVES[d][1] for d in directives])
+            if 'Y' in directives:
+                self.strftime = self._strftime_Y
+            elif 'y' in directives:
+                self.strftime = self._strftime_y
+            else:
+                self.strftime = self._strftime
+
+    def strptime(self, value):
+        # datetime.strptime 과 같은 결과를 만든다. 실패하면 strptime 이 같은 에러를 일으키도록 다시 실행한다.
+        if self.regex is None:
+            return datetime.datetime.strptime(value, self.format)
+        m = self.regex.match(value)
+        if m is None or m.end() != len(value):
+            return datetime.datetime.strptime(value, self.format)
+        year, month, day, hour, minute, second, microsecond = 1900, 1, 1, 0, 0, 0, 0
+        for i, directive in self.groups:
+            text = m.group(i)
+            if directive == 'Y':
+                year = int(text)
+            elif directive == 'm':
+                month = int(text)
+            elif directive == 'd':
+                day = int(text)
+            elif directive == 'H':
+                hour = int(text)
+            elif directive == 'M':
+                minute = int(text)
+            elif directive == 'S':
+                second = int(text)
+            elif directive == 'f':
+                microsecond = int(text + '0' * (6 - len(text)))
+            else:
+                year = int(text)
+                year += 2000 if year <= 68 else 1900
+        return datetime.datetime(year, month, day, hour, minute, second, microsecond)
+
+    def strftime(self, value):
+        return value.strftime(self.format)
+
+    def _strftime(self, value):
+        try:
+            return self.template % self.getter(value)
+        except AttributeError:
+            # datetime.date 의 시간이나 datetime.time 의 날짜
+            return value.strftime(self.format)
+
+    def _strftime_Y(self, value):
+        try:
+            if value.year >= 1000:
+                return self.template % self.getter(value)
+        except AttributeError:
+            pass
+        # 1000 년 이전의 %Y 는 플랫폼마다 다르다.
+        return value.strftime(self.format)
+
+    def _strftime_y(self, value):
+        try:
+            values = self.getter(value)
+        except AttributeError:
+            return value.strftime(self.format)
+        if len(self.directives) == 1:
+            values = (values,)
+        return self.template % tuple(v % 100 if d == 'y' else v for v, d in zip(values, self.directives))
+
+
+_strftime_formats = {}
+
+
+def _strftime_format(format):
+    compiled = _strftime_formats.get(format)
+    if compiled is None:
+        compiled = _strftime_formats[format] = _StrftimeFormat(format)
+    return compiled
+
+
 class DateTimeBase(Property):
     class Options(Property.Options):
         format = 'iso'
@@ -711,7 +995,16 @@ class DateTimeBase(Property):
         if formatter:
             return formatter.format(value, self.__class__, context)
         else:
-            return value.strftime(format)
+            return _strftime_format(format).strftime(value)
+
+    def _load_all_(self, values, context):
+        # 문자열들은 DateTimeFormat.parse_many 로 한 번에 변환한다.
+        opts = self._pm_opts_
+        if opts.validate is None and not (context._explicit_ and opts.codec is not None):
+            formatter = DateTimeFormat.get_formatter(opts.get('format', self.__class__.Options.format))
+            if formatter and _loads_with_format(type(self)) and all(isinstance(v, basestring_types) for v in values):
+                return formatter.parse_many(values, self.__class__, context)
+        return super(DateTimeBase, self)._load_all_(values, context)
 
     def _load_(self, value, context):
         format = self.get_options().get('format', self.__class__.Options.format)
@@ -719,7 +1012,7 @@ class DateTimeBase(Property):
         if formatter:
             return formatter.parse(value, self.__class__, context)
         else:
-            dt = datetime.datetime.strptime(value, format)
+            dt = _strftime_format(format).strptime(value)
             if isinstance(self, Time):
                 return dt.time()
             elif isinstance(self, Date):
@@ -982,6 +1275,14 @@ class Date(DateTimeBase):
         return super(Date, self)._load_(value, context)
 
 
+def _loads_with_format(cls):
+    # cls 가 문자열을 DateTimeFormat.parse 로 load 하면 True. load 과정을 재정의한 클래스는 False.
+    for klass in cls.__mro__:
+        if any(name in klass.__dict__ for name in ('load', '_load', '_load_')):
+            return klass in (DateTime, Time, Date)
+    return False
+
+
 class Duration(Property):
     """
     :py:class:`datetime.timedelta` 를 표현하는 :py:class:`Property`.
@@ -1017,6 +1318,7 @@ class Duration(Property):
 
     Since version 1.0.
     """
+    _ps_accepts_ = integer_types + (float, datetime.timedelta)
 
     class Options(Property.Options):
         unit = 'seconds'
@@ -1059,6 +1361,7 @@ class IpAddress(Property):
 
     Since version 1.0.
     """
+    _ps_accepts_ = text_types
 
     def _dump_(self, value, context):
         return str(value)
@@ -1088,6 +1391,7 @@ class Ipv4Address(IpAddress):
 
     Since version 1.0.
     """
+    _ps_accepts_ = text_types
 
     def _load_(self, value, context):
         if not isinstance(value, text_types):
@@ -1114,6 +1418,7 @@ class Ipv6Address(IpAddress):
 
     Since version 1.0.
     """
+    _ps_accepts_ = text_types
 
     def _load_(self, value, context):
         if not isinstance(value, text_types):
@@ -0,0 +1,683 @@
+# coding=utf-8
+# Copyright 2016 Flowdas Inc. <prospero@flowdas.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+import array
+import codecs
+import io
+import json
+import mmap
+import os
+import re
+from collections import OrderedDict
+
+from .compat import *
+from .property import Context
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*')
+_ERROR_POS = re.compile(r'\(char (\d+)')
+_TRUNCATION_MARGIN = 12  # 잘린 값의 에러가 보고될 수 있는 버퍼 끝으로부터의 거리. -Infinity, \uXXXX 등.
+
+_offset_typecode = 'q' if PY3 else 'l'
+
+if PY3:
+    _frombytes = array.array.frombytes
+    _tobytes = array.array.tobytes
+else:
+    _frombytes = array.array.fromstring
+    _tobytes = array.array.tostring
+
+
+class _JsonReader(object):
+    # 파일에서 chunk 단위로 읽으면서 JSON 값을 하나씩 해석한다. 이미 해석한 부분은 버퍼에서 버린다.
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = u''
+        self.pos = 0
+        self.offset = 0  # buf 의 시작이 입력에서 차지하는 위치
+        self.eof = False
+        self.text = None
+        self.mark = None  # None 이 아니면 버퍼에서 이 위치부터는 버리지 않는다.
+
+    def fill(self, size=None):
+        if self.eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            if self.text is not None:
+                self.text.decode(b'', final=True)
+            return False
+        if not isinstance(chunk, unicode_type):
+            if self.text is None:
+                self.text = codecs.getincrementaldecoder('utf-8')()
+            chunk = self.text.decode(chunk)
+        cut = self.pos if self.mark is None else self.mark
+        self.buf = self.buf[cut:] + chunk
+        self.pos -= cut
+        self.offset += cut
+        if self.mark is not None:
+            self.mark = 0
+        return True
+
+    def peek(self):
+        # 공백을 건너뛰고 다음 문자를 돌려준다. 끝이면 빈 문자열.
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return u''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError('expected %s at position %d' % (repr(char), self.offset + self.pos))
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError as e:
+                # 값이 chunk 경계에 걸친 경우만 더 읽는다. 큰 값을 위해 읽는 양을 늘려간다.
+                # 잘못된 값은 나머지를 읽지 않고 바로 에러를 일으킨다.
+                pos = self._error_pos(e)
+                if not self._truncated(e, pos) or not self.fill(max(self.chunk_size, len(self.buf) - self.pos)):
+                    raise ValueError('%s at position %d' % (getattr(e, 'msg', e), self.offset + (
+                        self.pos if pos is None else pos)))
+                continue
+            if self.buf[self.pos] in u'-0123456789' and _NUMBER_TAIL.match(self.buf, end).end() == len(self.buf) \
+                    and self.fill():
+                # 숫자는 chunk 경계 뒤로 이어질 수 있다. 앞부분만 해석되었을 수 있으므로 더 읽고 다시 해석한다.
+                continue
+            self.pos = end
+            return value
+
+    def _error_pos(self, e):
+        pos = getattr(e, 'pos', None)
+        if pos is None:
+            m = _ERROR_POS.search(str(e))
+            if m:
+                pos = int(m.group(1))
+        return pos
+
+    def _truncated(self, e, pos):
+        # 값이 버퍼의 끝에서 잘려서 생긴 에러인지 판단한다. 닫히지 않은 문자열은 문자열이 시작한 위치가 보고된다.
+        return pos is None or pos >= len(self.buf) - _TRUNCATION_MARGIN or str(e).startswith('Unterminated string')
+
+    def find(self, path):
+        # JSON Pointer 로 지정한 위치로 이동한다. 객체의 키만 지원한다.
+        for token in path.split('/')[1:]:
+            key = token.replace('~1', '/').replace('~0', '~')
+            self.expect(u'{')
+            while True:
+                if self.peek() == u'}':
+                    raise ValueError('%s not found' % path)
+                name = self.value()
+                self.expect(u':')
+                if name == key:
+                    break
+                self.value()
+                if self.peek() == u',':
+                    self.pos += 1
+
+    def items(self):
+        self.expect(u'[')
+        if self.peek() == u']':
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            try:
+                value = self.value()
+            except ValueError as e:
+                raise ValueError('/%d: %s' % (index, e))
+            yield value
+            index += 1
+            char = self.peek()
+            self.pos += 1
+            if char == u']':
+                return
+            if char != u',':
+                raise ValueError('expected \',\' or \']\' at position %d' % (self.offset + self.pos - 1))
+
+
+def load_iter(fp, property, context=None, path=None, chunk_size=65536):
+    """
+    파일에 저장된 JSON 배열의 원소들을 하나씩 load 하는 이터레이터.
+
+    ``fp`` 로 JSON 배열을 담고 있는 파일 객체를 제공한다. :py:class:`str` 이나 :py:class:`bytes` 를 돌려주는 ``read`` 메쏘드만 있으면 된다.
+    ``chunk_size`` 씩 읽으면서 원소 하나를 해석할 때마다 ``property`` 로 load 한 값을 제공하기 때문에,
+    전체 문서를 메모리에 올리지 않고 아주 큰 파일을 처리할 수 있다.
+
+    ``path`` 로 `JSON Pointer <https://tools.ietf.org/html/rfc6901>`_ 를 제공하면 그 위치의 배열을 사용한다.
+    객체의 키만 지원한다. 배열 뒤에 오는 내용은 읽지 않는다.
+
+    원소를 load 할 때 예외가 발생하면 이터레이션이 중단되고, ``context`` 의 ``errors`` 에는 원소의 인덱스를 포함한 위치가 제공된다.
+    원소가 올바른 JSON 이 아니면 나머지를 읽지 않고 ``/3: Expecting value at position 120`` 처럼 원소의 인덱스와 입력에서의 위치를 담은
+    :py:exc:`ValueError` 예외를 일으킨다.
+
+        .. literalinclude:: /../tests/ex/load_iter.rst
+
+    Since version 1.1.
+    """
+    if context is not None:
+        context = context._local_()
+    reader = _JsonReader(fp, chunk_size)
+    if path:
+        reader.find(path)
+    for i, value in enumerate(reader.items()):
+        try:
+            loaded = property.load(value, context)
+        except Exception:
+            if context is not None and context._errtree is not None:
+                context._errtree = OrderedDict([(i, context._errtree)])
+            raise
+        yield loaded
+
+
+try:
+    _StopAsyncIteration = StopAsyncIteration
+except NameError:
+    _StopAsyncIteration = StopIteration
+
+
+class _Starved(Exception):
+    # 받아둔 데이터가 모자라다.
+    pass
+
+
+class _Feed(object):
+    # 비동기로 받은 chunk 들을 _JsonReader 에 파일처럼 제공한다. 받아둔 것이 없으면 _Starved 예외를 일으킨다.
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.eof = False
+
+    def put(self, chunk):
+        if chunk:
+            self.chunks.append(chunk)
+            self.size += len(chunk)
+        else:
+            self.eof = True
+
+    def read(self, size=None):
+        if self.chunks:
+            chunk = self.chunks[0][:0].join(self.chunks)
+            self.chunks = []
+            self.size = 0
+            return chunk
+        if self.eof:
+            return b''
+        raise _Starved()
+
+
+class _AsyncLoader(object):
+    # aload_iter 와 aload_lines 가 돌려주는 비동기 이터레이터. _next 로 받아둔 데이터에서 다음 값을 해석하고,
+    # 데이터가 모자라면 source 에서 더 받은 후에 다시 시도한다.
+    # Python 2 에서도 import 할 수 있도록 async 문법 대신 프로토콜을 직접 구현한다.
+
+    def __init__(self, source, property, context, chunk_size):
+        self._source = source
+        self._property = property
+        self._context = context
+        self._chunk_size = chunk_size
+        self._feed = _Feed()
+        self._index = 0
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return _AsyncStep(self)
+
+    def _read(self):
+        # 다음 chunk 를 돌려주는 awaitable.
+        if hasattr(self._source, 'read'):
+            return self._source.read(self._chunk_size)
+        return self._source.__anext__()
+
+    def _wants(self):
+        # 다시 시도하기 전에 받아둘 양.
+        return 1
+
+    def _next(self):
+        raise NotImplementedError()
+
+    def _fail(self, e):
+        raise e
+
+
+class _AsyncStep(object):
+    # _AsyncLoader 의 원소 하나를 제공하는 awaitable. chunk 를 받거나 값을 aload 하는 awaitable 을 대신 기다린다.
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._inner = None
+        self._reading = False
+
+    def __await__(self):
+        return self
+
+    __iter__ = __await__
+
+    def __next__(self):
+        return self.send(None)
+
+    next = __next__
+
+    def send(self, value):
+        return self._run(value, None)
+
+    def throw(self, typ, val=None, tb=None):
+        if val is None:
+            val = typ() if isinstance(typ, type) else typ
+        return self._run(None, val)
+
+    def close(self):
+        if self._inner is not None and hasattr(self._inner, 'close'):
+            self._inner.close()
+
+    def _run(self, value, exc):
+        loader = self._loader
+        feed = loader._feed
+        while True:
+            if self._inner is not None:
+                try:
+                    return self._inner.send(value) if exc is None else self._inner.throw(exc)
+                except StopIteration as e:
+                    value, exc = e.args[0] if e.args else None, None
+                except _StopAsyncIteration:
+                    value, exc = b'', None
+                except Exception as e:
+                    if self._reading:
+                        raise
+                    value, exc = None, e
+                self._inner = None
+                if not self._reading:
+                    # 값의 aload 가 끝났다.
+                    if exc is not None:
+                        loader._fail(exc)
+                    raise StopIteration(value)
+                feed.put(value)
+                if feed.size < loader._wants() and not feed.eof:
+                    self._start(loader._read(), True)
+                    value = None
+                    continue
+            try:
+                raw = loader._next()
+            except _Starved:
+                self._start(loader._read(), True)
+                value = None
+                continue
+            if raw is _end:
+                raise _StopAsyncIteration()
+            self._start(loader._property.aload(raw, loader._context), False)
+            value = None
+
+    def _start(self, awaitable, reading):
+        self._reading = reading
+        self._inner = awaitable.__await__() if hasattr(awaitable, '__await__') else iter(awaitable)
+
+
+_end = object()
+
+
+class _AsyncItems(_AsyncLoader):
+    # load_iter 처럼 JSON 배열의 원소들을 제공한다.
+
+    def __init__(self, source, property, context, path, chunk_size):
+        super(_AsyncItems, self).__init__(source, property, context, chunk_size)
+        self._reader = _JsonReader(self._feed, chunk_size)
+        self._path = path
+        self._state = 'start'
+
+    def _wants(self):
+        # 큰 값을 여러 번 다시 해석하지 않도록, 해석중인 값의 크기만큼 더 받는다.
+        reader = self._reader
+        return max(1, len(reader.buf) - reader.pos)
+
+    def _next(self):
+        # 해석을 마친 부분은 _state 와 reader.mark 로 기록해 두고, 데이터가 모자라면 mark 로 되돌린다.
+        reader = self._reader
+        reader.mark = reader.pos
+        try:
+            if self._state == 'start':
+                if self._path:
+                    reader.find(self._path)
+                reader.expect(u'[')
+                if reader.peek() == u']':
+                    reader.pos += 1
+                    self._state = 'end'
+                else:
+                    self._state = 'item'
+                reader.mark = reader.pos
+            elif self._state == 'next':
+                char = reader.peek()
+                reader.pos += 1
+                if char == u']':
+                    self._state = 'end'
+                elif char == u',':
+                    self._state = 'item'
+                else:
+                    raise ValueError('expected \',\' or \']\' at position %d' % (reader.offset + reader.pos - 1))
+                reader.mark = reader.pos
+            if self._state == 'end':
+                return _end
+            try:
+                value = reader.value()
+            except ValueError as e:
+                raise ValueError('/%d: %s' % (self._index, e))
+            self._state = 'next'
+            self._index += 1
+            return value
+        except _Starved:
+            reader.pos = reader.mark
+            raise
+        finally:
+            reader.mark = None
+
+    def _fail(self, e):
+        context = self._context
+        if context is not None:
+            context = context._local_()
+            if context._errtree is not None:
+                context._errtree = OrderedDict([(self._index - 1, context._errtree)])
+        raise e
+
+
+class _AsyncLines(_AsyncLoader):
+    # load_lines 처럼 JSON Lines 의 줄들을 제공한다.
+
+    def __init__(self, source, property, context, chunk_size):
+        super(_AsyncLines, self).__init__(source, property, context, chunk_size)
+        self._decode = json.JSONDecoder().decode
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = u''
+        self._pos = 0  # 다음 줄의 시작. 앞부분은 chunk 를 받을 때 한꺼번에 버린다.
+        self._scan = 0  # 이 위치 앞에는 줄바꿈이 없다.
+
+    def _next(self):
+        while True:
+            chunk = self._feed.read()
+            if chunk:
+                if not isinstance(chunk, unicode_type):
+                    chunk = self._text.decode(chunk)
+                self._buf = self._buf[self._pos:] + chunk
+                self._scan -= self._pos
+                self._pos = 0
+            end = self._buf.find(u'\n', self._scan)
+            if end < 0:
+                if not self._feed.eof:
+                    self._scan = len(self._buf)
+                    raise _Starved()
+                if self._pos >= len(self._buf):
+                    return _end
+                end = len(self._buf)
+            line = self._buf[self._pos:end]
+            self._pos = self._scan = end + 1
+            self._index += 1
+            if line and not line.isspace():
+                try:
+                    return self._decode(line)
+                except ValueError as e:
+                    self._fail(e)
+
+    def _fail(self, e):
+        raise _line_error(self._index, self._context, e)
+
+
+def aload_iter(source, property, context=None, path=None, chunk_size=65536):
+    """
+    :py:func:`load_iter` 의 비동기 버전. 비동기 이터레이터를 돌려준다.
+
+    ``source`` 로는 :py:class:`asyncio.StreamReader` 처럼 ``read(n)`` 코루틴을 제공하는 객체나, :py:class:`bytes` 나 :py:class:`str`
+    chunk 들을 제공하는 비동기 이터레이터를 준다. 데이터가 도착하는 대로 해석해서 원소가 완성될 때마다 :py:meth:`Property.aload` 한 값을 제공한다.
+    요청 본문을 모두 받을 때까지 기다리지 않고 받는 동안 load 할 수 있다.
+
+    ``path`` 와 에러 처리는 :py:func:`load_iter` 와 같다.
+
+        .. literalinclude:: /../tests/ex/aload_iter.rst
+
+    Since version 1.1.
+    """
+    return _AsyncItems(source, property, context, path, chunk_size)
+
+
+def aload_lines(source, property, context=None, chunk_size=65536):
+    """
+    :py:func:`load_lines` 의 비동기 버전. 비동기 이터레이터를 돌려준다.
+
+    ``source`` 는 :py:func:`aload_iter` 와 같고, 줄이 완성될 때마다 :py:meth:`Property.aload` 한 값을 제공한다.
+    에러 처리는 :py:func:`load_lines` 와 같다.
+
+    Since version 1.1.
+    """
+    if isinstance(property, type):
+        property = property()
+    return _AsyncLines(source, property, _line_context(context), chunk_size)
+
+
+def _line_context(context):
+    # 모든 줄에 하나의 Context 를 사용한다. 제공되지 않으면 context 없이 load 하는 것과 같은 Context 를 만든다.
+    if context is None:
+        context = Context()
+        context._explicit_ = False
+    return context._local_()
+
+
+def _line_error(lineno, context, e, label='line'):
+    errors = context.errors
+    return ValueError('%s %d: %s' % (label, lineno, errors[0].location if errors else e))
+
+
+def load_lines(fp, property, context=None):
+    """
+    `JSON Lines <http://jsonlines.org/>`_ (NDJSON) 파일의 줄들을 하나씩 load 하는 이터레이터.
+
+    ``fp`` 로 파일 객체를, ``property`` 로 :py:class:`Property` 인스턴스나 :py:class:`Entity` 클래스를 제공한다.
+    한 줄씩 읽기 때문에 파일의 크기와 관계없이 일정한 메모리를 사용한다. 빈 줄은 무시한다.
+
+    모든 줄에 ``context`` 를 함께 사용한다. 에러가 발생하면 ``line 10423: /authors/0/name`` 처럼 줄 번호와 위치를 담은
+    :py:exc:`ValueError` 예외를 일으키고 이터레이션이 중단된다. 세부 정보는 ``context`` 로 제공된다.
+
+        .. literalinclude:: /../tests/ex/load_lines.rst
+
+    Since version 1.1.
+    """
+    if isinstance(property, type):
+        property = property()
+    context = _line_context(context)
+    decode = json.JSONDecoder().decode
+    for lineno, line in enumerate(fp, 1):
+        if isinstance(line, bytes_type):
+            line = line.decode('utf-8')
+        if not line or line.isspace():
+            continue
+        try:
+            value = property.load(decode(line), context)
+        except ValueError as e:
+            raise _line_error(lineno, context, e)
+        yield value
+
+
+def dump_lines(values, fp, context=None):
+    """
+    ``values`` 의 값들을 `JSON Lines <http://jsonlines.org/>`_ (NDJSON) 로 ``fp`` 에 기록한다.
+
+    ``values`` 로는 :py:class:`Entity` 인스턴스들을 제공한다. 이터레이터를 제공하면 일정한 메모리로 기록할 수 있다.
+    ``fp`` 가 바이너리 파일이면 UTF-8 로 인코딩한다.
+
+    모든 값에 ``context`` 를 함께 사용한다. 에러가 발생하면 :py:func:`load_lines` 처럼 줄 번호와 위치를 담은 :py:exc:`ValueError`
+    예외를 일으킨다.
+
+    기록한 줄 수를 돌려준다.
+
+    Since version 1.1.
+    """
+    context = _line_context(context)
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or (PY2 and not isinstance(fp, io.TextIOBase))
+    write = fp.write
+    lineno = 0
+    for lineno, value in enumerate(values, 1):
+        try:
+            line = encode(value.dump(context)) + u'\n'
+        except ValueError as e:
+            raise _line_error(lineno, context, e)
+        write(line.encode('utf-8') if binary else line)
+    return lineno
+
+
+class EntityFile(Sequence):
+    """
+    `JSON Lines <http://jsonlines.org/>`_ (NDJSON) 파일을 메모리 매핑해서 레코드 단위로 읽는 읽기 전용 컨테이너.
+
+    ``path`` 로 파일의 경로를, ``property`` 로 :py:class:`Property` 인스턴스나 :py:class:`Entity` 클래스를 제공한다.
+    :py:class:`Sequence` 인터페이스를 제공하는데, ``store[i]`` 는 ``i`` 번째 레코드만 load 하고 슬라이스는 해당하는 레코드들의
+    :py:class:`list` 를 돌려준다. 빈 줄과 공백만 있는 줄은 레코드로 보지 않는다.
+
+    레코드의 위치들은 ``index_path`` (기본값은 ``path`` 에 ``.idx`` 를 붙인 경로) 에 저장해두고 다음에 다시 사용한다.
+    파일의 크기나 수정 시각이 바뀌었으면 새로 만든다. 인덱스를 저장할 수 없는 경우는 메모리에만 유지한다.
+
+    ``context`` 를 주면 모든 레코드를 load 할 때 사용한다. 에러가 발생하면 ``record 3: /name`` 처럼 레코드 번호와 위치를 담은
+    :py:exc:`ValueError` 예외를 일으킨다. 레코드 번호는 :py:func:`load_lines` 의 줄 번호처럼 1 부터 센다.
+
+    사용이 끝나면 :py:meth:`EntityFile.close` 를 호출해야 한다. ``with`` 문을 지원한다.
+
+    Since version 1.1.
+    """
+
+    _version = 2
+
+    def __init__(self, path, property, context=None, index_path=None):
+        if isinstance(property, type):
+            property = property()
+        self._property = property
+        self._context = context
+        self._path = path
+        self._index_path = index_path or path + '.idx'
+        self._fp = open(path, 'rb')
+        try:
+            stat = os.fstat(self._fp.fileno())
+            # 빈 파일은 매핑할 수 없다.
+            self._mmap = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else None
+            header = [self._version, stat.st_size, int(stat.st_mtime * 1000000)]
+            self._offsets = self._read_index(header)
+            if self._offsets is None:
+                self._offsets = self._build_index()
+                self._write_index(header)
+        except:
+            self.close()
+            raise
+
+    def __repr__(self):
+        return 'EntityFile(%s, %d records)' % (repr(self._path), len(self._offsets))
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load(i) for i in range(*index.indices(len(self._offsets)))]
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError('EntityFile index out of range')
+        return self._load(index)
+
+    def __iter__(self):
+        for i in range(len(self._offsets)):
+            yield self._load(i)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        파일과 메모리 매핑을 닫는다.
+
+        Since version 1.1.
+        """
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._fp.close()
+
+    def _load(self, i):
+        if self._fp.closed:
+            raise ValueError('I/O operation on closed EntityFile')
+        start = self._offsets[i]
+        end = self._mmap.find(b'\n', start)
+        line = self._mmap[start:] if end < 0 else self._mmap[start:end]
+        context = _line_context(self._context)
+        try:
+            return self._property.loads(line, context)
+        except ValueError as e:
+            raise _line_error(i + 1, context, e, 'record')
+
+    def _build_index(self):
+        offsets = array.array(_offset_typecode)
+        data = self._mmap
+        if data is None:
+            return offsets
+        find = data.find
+        size = len(data)
+        start = 0
+        while start < size:
+            end = find(b'\n', start)
+            if end < 0:
+                end = size
+            if data[start:end].strip():
+                offsets.append(start)
+            start = end + 1
+        return offsets
+
+    def _read_index(self, header):
+        try:
+            with open(self._index_path, 'rb') as fp:
+                data = fp.read()
+        except (IOError, OSError):
+            return None
+        offsets = array.array(_offset_typecode)
+        try:
+            _frombytes(offsets, data)
+        except ValueError:
+            return None
+        if offsets[:len(header)].tolist() != header:
+            return None
+        return offsets[len(header):]
+
+    def _write_index(self, header):
+        # 다른 프로세스가 불완전한 인덱스를 읽지 않도록 임시 파일에 기록한 후에 이름을 바꾼다.
+        tmp = '%s.%d.tmp' % (self._index_path, os.getpid())
+        try:
+            with open(tmp, 'wb') as fp:
+                fp.write(_tobytes(array.array(_offset_typecode, header) + self._offsets))
+            getattr(os, 'replace', os.rename)(tmp, self._index_path)
+        except (IOError, OSError):
+            try:
+                os.remove(tmp)
+            except (IOError, OSError):
+                pass
+
+
+__all__ = [
+    'aload_iter',
+    'aload_lines',
+    'load_iter',
+    'load_lines',
+    'dump_lines',
+    'EntityFile',
+]
@@ -8,6 +8,13 @@ import inspect
 
 
 class TypeMeta(type):
+    def __new__(mcs, name, bases, attrs):
+        for base in bases:
+            if hasattr(base, '_new_'):
+                attrs = base._new_(name, bases, attrs)
+                break
+        return super(TypeMeta, mcs).__new__(mcs, name, bases, attrs)
+
     def __init__(cls, name, bases, attrs):
         meta = attrs.get(cls.MetaOptions._metaoptions)
         if meta:
@@ -25,6 +32,7 @@ class TypeMeta(type):
 
 
 class TypeBase(object):
+    __slots__ = ()
     _ts_opts_ = None
 
     class Options(object):
@@ -67,6 +75,18 @@ class TypeBase(object):
         def _unknown_option(self, key):
             raise TypeError("class %s got an unexpected member '%s'" % (self._metaoptions, key))
 
+    @staticmethod
+    def _new_(name, bases, attrs):
+        """
+        클래스 생성.
+
+        클래스가 만들어지기 전에 베이스 클래스에서 한번 호출된다. ``__slots__`` 처럼 클래스가 만들어진 후에는 바꿀 수 없는 것들을 결정한다.
+
+        @param attrs: 클래스에서 정의된 attribute 들을 담고 있는 dict.
+        @return: 클래스를 만드는데 사용할 attribute 들을 담고 있는 dict.
+        """
+        return attrs
+
     @staticmethod
     def _init_(cls, attrs, options):
         """
@@ -107,7 +127,7 @@ class TypeBase(object):
         return self._ts_opts_
 
 
-Type = TypeMeta('Type', (TypeBase,), {})
+Type = TypeMeta('Type', (TypeBase,), {'__slots__': ()})
 
 __all__ = [
 ]
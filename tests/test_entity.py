@@ -1,6 +1,9 @@
 # coding=utf-8
 from __future__ import print_function
 
+import array
+import datetime
+import json
 import random
 from collections import OrderedDict
 
@@ -710,6 +713,66 @@ def test_union_with_error():
     assert ctx.errors[0].location == '/a/0'
 
 
+def test_union_dispatch(monkeypatch):
+    class K(meta.Entity):
+        kind = meta.Kind()
+        x = meta.Integer()
+
+    class KA(K):
+        kind = 'a'
+
+    class KB(K):
+        kind = 'b'
+        y = meta.Integer()
+
+    class Point(meta.Entity):
+        x = meta.Integer()
+        y = meta.Integer()
+
+    class U(meta.Union):
+        b = meta.Boolean(ordered=True)
+        i = meta.Integer(ordered=True)
+        u = meta.Unicode(ordered=True)
+        pair = meta.Tuple(meta.Integer(), meta.Integer()).apply_options(ordered=True)
+        ints = meta.Tuple(meta.Integer(), repeat=Ellipsis).apply_options(ordered=True)
+        kb = KB(ordered=True)
+        ka = KA(ordered=True)
+        point = Point(ordered=True)
+        j = meta.JsonObject(ordered=True)
+        any = meta.Primitive(ordered=True)
+
+    def trial(value, context):
+        # 모든 Property 를 차례대로 시도하던 이전의 동작
+        for key, p in U._cs_fields_.items():
+            try:
+                return key, p.load(value, context.copy())
+            except:
+                pass
+        return None, None
+
+    copies = []
+    copy = meta.Context.copy
+    monkeypatch.setattr(meta.Context, 'copy', lambda self: copies.append(1) or copy(self))
+
+    # 값과 시도하는 Property 의 수. 타입과 모양만으로는 1.5 의 Integer, [1, 'a'] 의 Tuple 들을 제외할 수 없다.
+    cases = [(True, 1), (1, 1), (1.0, 1), (1.5, 2), (u'a', 1), ([1, 2], 1), ([1, 2, 3], 1), ([1, 'a'], 3), ((), 1),
+             ({'kind': 'a', 'x': 1}, 1), ({'kind': 'b', 'y': 1}, 1), ({'kind': 'c'}, 1), ({'x': 1, 'y': 2}, 1),
+             ({'x': 1, 'z': 2}, 1), ({'kind': [1]}, 1), (KA({'x': 1}), 1), (Point({'x': 1}), 1)]
+    for strict in (False, True):
+        for value, attempts in cases:
+            expected = trial(value, meta.Context(strict=strict))
+            del copies[:]
+            u = U().load(value, meta.Context(strict=strict))
+            assert u.get_item() == expected
+            assert type(u.get_value()) is type(expected[1])
+            assert len(copies) == attempts
+
+    del copies[:]
+    with pytest.raises(ValueError):
+        U().load(object(), meta.Context())
+    assert copies == []
+
+
 #
 # dict interface: mostly borrowed from Python 3.X test.test_dict
 #
@@ -1236,3 +1299,809 @@ def test_is_visible():
         assert x.is_visible('a', private)
         assert not x.is_visible('b', private)
         assert x.is_visible('c', private)
+
+
+def test_view_plan():
+    class P(meta.Integer):
+        def _isvisible_(self, context):
+            return context.view is None
+
+    class X(meta.Entity):
+        a = meta.Integer(required=True, name='A')
+        b = meta.Integer()
+        c = meta.Integer(view='private')
+        d = meta.Integer(view=['private', 'admin'])
+        e = P()
+
+    class Y(X):
+        e = meta.Integer(view='admin')
+
+    data = {'A': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5}
+    contexts = [lambda: meta.Context(), lambda: meta.Context(view='public'), lambda: meta.Context(view='private'),
+                lambda: meta.Context(view=['private', 'admin']), lambda: meta.Context(view='admin')]
+    for cls in (X, Y):
+        for only in (None, 'b', ['c', 'e']):
+            for make in contexts:
+                # 컴파일한 코드와 에러를 추적하는 코드가 is_visible 과 같은 결과를 내야 한다.
+                expected = dict((k, v) for k, v in cls().load(data).items() if cls(only=only).is_visible(k, make()))
+                ctx = make()
+                assert dict(cls(only=only).load(data, ctx)) == expected
+                ctx = make()
+                ctx._optimistic_ = False
+                assert dict(cls(only=only).load(data, ctx)) == expected
+                x = cls(only=only).load(data)
+                ctx = make()
+                expected = dict((cls._cs_fields_[k]._pm_opts_.get('name', k), v) for k, v in x.items()
+                                if x.is_visible(k, ctx))
+                assert x.dump(make()) == expected
+                ctx = make()
+                ctx._optimistic_ = False
+                assert x.dump(ctx) == expected
+                assert json.loads(x.dumps(make())) == expected
+
+    assert (None, frozenset(['private'])) in Y.__dict__['_es_plans_']
+    assert Y.__dict__['_es_plans_'][None, frozenset(['private'])].keys == ('a', 'b', 'c', 'd')
+    assert X.__dict__['_es_plans_'][None, None].keys is None
+
+    class Z(meta.Entity):
+        a = meta.Integer()
+        b = meta.Integer(view='private')
+
+        def is_visible(self, key, context, instance=None):
+            return key == 'b'
+
+    ctx = meta.Context(view='public')
+    ctx._optimistic_ = False
+    assert Z().load({'a': 1, 'b': 2}, ctx) == {'b': 2}
+
+
+def test_compile():
+    class A(meta.Entity):
+        kind = meta.Kind('A')
+        name = meta.Unicode(required=True)
+        age = meta.Integer(view='private')
+
+    class B(A):
+        kind = 'B'
+        score = meta.Float()
+
+    class C(A):
+        kind = 'C'
+
+    class X(meta.Entity):
+        authors = A[:]()
+        title = meta.Unicode(name='Title')
+
+    A.compile()
+    for klass in (A, B, C):
+        assert '_es_loader_' in klass.__dict__
+        assert '_es_dumper_' in klass.__dict__
+    assert '_es_loader_' not in X.__dict__
+
+    value = {'authors': [{'kind': 'C', 'name': 'a', 'age': 1}, {'kind': 'B', 'name': 'b', 'score': 1.5}], 'Title': 't'}
+    x = X().load(value)
+    assert '_es_loader_' in X.__dict__
+    assert type(x.authors[1]) is B
+    assert x.dump() == value
+    assert X().load(value, meta.Context(view='private')) == x
+    assert 'age' not in X().load(value, meta.Context(view='public')).authors[0]
+
+    ctx = meta.Context(strict=True)
+    with pytest.raises(ValueError):
+        X().load({'authors': [{'kind': 'C', 'name': 'a', 'age?': 1}]}, ctx)
+    assert [e.location for e in ctx.errors] == ['/authors/0/age?']
+
+    ctx = meta.Context(max_errors=5)
+    with pytest.raises(ValueError):
+        X().load({'authors': [{'kind': 'C', 'name': None, 'age': 'x'}], 'Title': 1}, ctx)
+    assert [e.location for e in ctx.errors] == ['/authors/0/name', '/authors/0/age', '/Title']
+
+    class H(meta.Entity):
+        a = meta.Integer()
+        b = meta.Integer()
+
+        def is_visible(self, key, context, instance=None):
+            return key != 'b' and super(H, self).is_visible(key, context, instance)
+
+    class Y(meta.Entity):
+        h = H()
+
+    assert H().load({'a': 1, 'b': 2}).b is None
+    assert Y().load({'h': {'a': 1, 'b': 2}}).h.b is None
+
+
+def test_compile_dump():
+    class Odd(meta.Integer):
+        def _dump_(self, value, context):
+            if value % 2:
+                raise ValueError()
+            return value
+
+    class A(meta.Entity):
+        kind = meta.Kind('A', name='KIND')
+        name = meta.Unicode(required=True, ordered=True)
+        age = meta.Integer(view='private')
+
+    class B(A):
+        kind = 'B'
+        n = meta.Integer(default=7)
+
+    class X(meta.Entity):
+        authors = A[:]()
+        title = meta.Unicode(name='Title')
+        odd = Odd[:]()
+        none = meta.Integer()
+
+    x = X()
+    x.authors = [B({'name': 'a', 'age': 1}), B({'name': 'b'})]
+    x.title = 't'
+    x.none = meta.Null
+
+    assert x.dump() == {'authors': [{'name': 'a', 'KIND': 'B', 'age': 1, 'n': 7}, {'name': 'b', 'KIND': 'B', 'n': 7}],
+                        'Title': 't', 'none': None}
+    assert '_es_dumper_' in X.__dict__
+    assert list(x.dump()['authors'][0].keys()) == ['name', 'KIND', 'age', 'n']
+    assert 'age' not in x.dump(meta.Context(view='public'))['authors'][0]
+    assert X(only=['title']).dump(x) == {'Title': 't'}
+    assert X(only=[]).dump(x) == x.dump()
+
+    x.odd = [0, 1, 2, 3]
+    ctx = meta.Context(max_errors=5)
+    with pytest.raises(ValueError):
+        x.dump(ctx)
+    assert [e.location for e in ctx.errors] == ['/odd/1', '/odd/3']
+
+    @meta.declare
+    class R(meta.Entity):
+        pass
+
+    class R(meta.Entity):
+        r = R()
+
+    r = R()
+    r.r = R()
+    r.r.r = r
+    ctx = meta.Context()
+    with pytest.raises(OverflowError):
+        r.dump(ctx)
+    assert [e.location for e in ctx.errors] == ['/r/r']
+
+
+def test_dumps():
+    class Odd(meta.Integer):
+        def _dump_(self, value, context):
+            if value % 2:
+                raise ValueError()
+            return value
+
+    class A(meta.Entity):
+        kind = meta.Kind('A', name='KIND')
+        name = meta.Unicode(required=True, ordered=True)
+        age = meta.Integer(view='private')
+
+    class B(A):
+        kind = 'B'
+        n = meta.Integer(default=7)
+        score = meta.Float()
+
+    class X(meta.Entity):
+        authors = A[:]()
+        title = meta.Unicode(name='Title')
+        odd = Odd[:]()
+        none = meta.Integer()
+        when = meta.DateTime()
+
+    x = X()
+    x.authors = [B({'name': u'\uac00"\n', 'age': 1, 'score': 0.5}), None, B({'name': 'b'})]
+    x.title = 't'
+    x.none = meta.Null
+    x.when = datetime.datetime(2016, 1, 2, 3, 4, 5, tzinfo=meta.compat.timezone.utc)
+
+    assert json.loads(x.dumps()) == x.dump()
+    assert '_es_writer_' in X.__dict__
+    assert x.dumps() == json.dumps(x.dump(), ensure_ascii=False, separators=(',', ':'))
+    assert x.dumps() == unicode_type(x)
+    assert json.loads(x.dumps(meta.Context(view='public'))) == x.dump(meta.Context(view='public'))
+    assert X(only=['title']).dumps(x) == u'{"Title":"t"}'
+    assert X().dumps(None) == u'null'
+    assert X().dumps(X()) == u'{}'
+    assert X.authors.dumps(x.authors) == json.dumps(X.authors.dump(x.authors), ensure_ascii=False,
+                                                    separators=(',', ':'))
+
+    x.odd = [0, 1, 2, 3]
+    ctx = meta.Context(max_errors=5)
+    with pytest.raises(ValueError):
+        x.dumps(ctx)
+    assert [e.location for e in ctx.errors] == ['/odd/1', '/odd/3']
+
+    @meta.declare
+    class R(meta.Entity):
+        pass
+
+    class R(meta.Entity):
+        r = R()
+
+    r = R()
+    r.r = R()
+    r.r.r = r
+    ctx = meta.Context()
+    with pytest.raises(OverflowError):
+        r.dumps(ctx)
+    assert [e.location for e in ctx.errors] == ['/r/r']
+
+
+def test_loads():
+    calls = []
+
+    class P(meta.Integer):
+        def _load_(self, value, context):
+            calls.append(value)
+            return super(P, self)._load_(value, context)
+
+    class A(meta.Entity):
+        kind = meta.Kind('A', name='KIND')
+        name = meta.Unicode(required=True)
+
+    class B(A):
+        kind = 'B'
+        n = P()
+
+    class C(A):
+        kind = 'C'
+
+    class X(meta.Entity):
+        authors = A[:]()
+        title = meta.Unicode(name='Title')
+
+    text = u'{"authors":[{"KIND":"B","name":"\uac00","n":1},{"KIND":"C","name":"b"}],"Title":"t"}'
+    x = X().loads(text)
+    assert x == X().load(json.loads(text))
+    assert isinstance(x.authors[0], B)
+    assert X().loads(text.encode('utf-8')) == x
+    assert X().loads(u'null') is None
+    assert X.authors.loads(u'[{"KIND":"C","name":"c"}]') == (C({'name': 'c'}),)
+
+    del calls[:]
+    X().loads(text)
+    assert calls == [1]
+    del calls[:]
+    X().loads(text, meta.Context(optimistic=False))
+    assert calls == [1]
+
+    ctx = meta.Context()
+    with pytest.raises(ValueError):
+        X().loads(u'{"authors":[{"KIND":"B","name":null}]}', ctx)
+    assert [e.location for e in ctx.errors] == ['/authors/0/name']
+
+    with pytest.raises(ValueError):
+        X().loads(u'{"Title":')
+
+
+def test_lazy():
+    calls = []
+
+    class P(meta.Integer):
+        def _load_(self, value, context):
+            calls.append(value)
+            return super(P, self)._load_(value, context)
+
+    class A(meta.Entity):
+        name = meta.Unicode(required=True)
+        n = P()
+
+    class B(meta.Entity):
+        a = A()
+
+    class X(meta.Entity):
+        a = A()
+        b = B()
+        aa = A[:]()
+        n = P()
+
+    value = {'a': {'name': 'a', 'n': 1}, 'b': {'a': {'name': 'b', 'n': 2}}, 'aa': [{'name': 'c', 'n': 3}], 'n': 4}
+    expected = X().load(value)
+    for optimistic in (True, False):
+        del calls[:]
+        x = X().load(value, meta.Context(lazy=True, optimistic=optimistic))
+        assert calls == [4]
+        assert x.a.n == 1
+        assert calls == [4, 1]
+        b = x.b
+        assert calls == [4, 1]
+        assert b.a.name == 'b'
+        assert calls == [4, 1, 2]
+        assert x == expected
+        assert calls == [4, 1, 2, 3]
+        assert x.dump() == value
+        assert calls == [4, 1, 2, 3]
+
+    x = X().load(value, meta.Context(lazy=True))
+    assert x.dump() == value
+    assert x.copy() == x
+    x.aa = []
+    assert x.aa == ()
+
+    value = {'a': {'name': 'a', 'n': 'x'}, 'aa': [{'name': 'c'}, {}], 'n': 4}
+    ctx = meta.Context(lazy=True)
+    x = X().load(value, ctx)
+    assert ctx.errors is None
+    with pytest.raises(ValueError) as e:
+        x.a
+    assert str(e.value) == '/a/n'
+    with pytest.raises(ValueError) as e:
+        x.dump()
+    assert str(e.value) in ('/a/n', '/aa/1/name')
+    with pytest.raises(ValueError):
+        X().load(value, meta.Context())
+
+    class S(X):
+        class Meta:
+            slots = True
+
+    del calls[:]
+    S().load({'a': {'name': 'a', 'n': 1}}, meta.Context(lazy=True))
+    assert calls == [1]
+
+
+def test_slots():
+    def define(flag):
+        class A(meta.Entity):
+            kind = meta.Kind('A', name='KIND')
+            name = meta.Unicode(required=True, ordered=True)
+            age = meta.Integer(view='private')
+
+            class Meta:
+                slots = flag
+
+        class B(A):
+            kind = 'B'
+            n = meta.Integer(default=7)
+
+        return A, B
+
+    A, B = define(False)
+    SA, SB = define(True)
+
+    assert SA._ts_opts_.slots
+    assert not SB._ts_opts_.slots
+    for cls in (SA, SB):
+        assert not hasattr(cls(), '__dict__')
+
+    data = {'KIND': 'B', 'age': 1, 'name': 'x'}
+    b = B().load(data)
+    sb = SB().load(data)
+    assert isinstance(sb, SB)
+    assert sb.dump() == b.dump() == {'KIND': 'B', 'age': 1, 'name': 'x', 'n': 7}
+    assert sb.dump(meta.Context(view='public')) == b.dump(meta.Context(view='public'))
+    assert dict(sb) == dict(b)
+
+    sb = SB({'name': 'y'})
+    assert 'age' not in sb
+    assert sb.age is None
+    assert len(sb) == 1
+    sb['age'] = 3
+    assert dict(sb) == {'name': 'y', 'age': 3}
+    sb.update(age=4)
+    assert sb.age == 4
+    del sb['age']
+    assert 'age' not in sb
+    with pytest.raises(KeyError):
+        del sb['undefined']
+    assert sb.n == 7
+    assert list(sb.keys()) == ['name', 'n']
+    assert sb.copy() == sb
+    sb.clear()
+    assert len(sb) == 0
+    assert sb.dump() == {'KIND': 'B', 'n': 7}
+
+    with pytest.raises(AttributeError):
+        sb.undefined = 1
+
+    for cls in (B, SB):
+        ctx = meta.Context()
+        with pytest.raises(ValueError):
+            cls().load({'KIND': 'B', 'age': 'x'}, ctx)
+        assert [e.location for e in ctx.errors] == ['/age']
+
+
+def test_slots_subclasses():
+    # 계층에 __slots__ 가 선언되어도 slots 옵션이 없는 서브 클래스는 __dict__ 를 갖는다.
+    class Tagged(meta.Integer):
+        label = 'none'
+
+        def __init__(self, label=None, **kwargs):
+            super(Tagged, self).__init__(**kwargs)
+            if label is not None:
+                self.label = label
+            self.extra = []
+
+    class A(meta.Entity):
+        x = Tagged('x', default=1)
+        y = Tagged()
+
+    assert A.x.label == 'x' and A.y.label == 'none'
+    assert A.x.extra == [] and A.x.extra is not A.y.extra
+    assert A.x._pm_key_ == 'x' and Tagged()._pm_key_ is None
+
+    a = A()
+    a.note = 'n'
+    assert a.note == 'n' and 'note' not in a
+    assert a.dump() == {'x': 1}
+    assert A().load({'x': 2, 'y': 3}).dump() == {'x': 2, 'y': 3}
+    f, args = a.__reduce__()[:2]
+    assert f(*args) == a
+    with pytest.raises(AttributeError):
+        Tagged().undefined
+
+
+def test_cache():
+    class A(meta.Entity):
+        name = meta.Unicode()
+        age = meta.Integer(view='private')
+
+        class Meta:
+            cache = True
+
+    class C(A):
+        pass
+
+    class B(meta.Entity):
+        a = A()
+        l = meta.Tuple(A(), repeat=Ellipsis)
+        j = meta.JsonObject()
+        c = C()
+
+        class Meta:
+            cache = True
+
+    assert A._ts_opts_.cache and not C._ts_opts_.cache
+    assert type(C()._em_data_) is dict
+
+    with pytest.raises(TypeError):
+        class S(meta.Entity):
+            class Meta:
+                slots = True
+                cache = True
+
+    a = A({'name': 'x', 'age': 1})
+    assert a.dumps() == '{"name":"x","age":1}'
+    assert a._em_data_.cache
+    assert a.dumps(meta.Context(view='public')) == '{"name":"x"}'
+    assert a.dumps() == '{"name":"x","age":1}'
+    a.age = 2
+    assert not a._em_data_.cache
+    assert a.dumps() == '{"name":"x","age":2}'
+    for mutate in (lambda: a.update(age=3), lambda: a.pop('age'), lambda: a.setdefault('age', 4),
+                   lambda: a.__delitem__('age'), lambda: a.clear()):
+        a.dumps()
+        mutate()
+        assert json.loads(a.dumps()) == a.dump()
+
+    b = B().load({'a': {'name': 'a'}, 'l': [{'name': 'l0'}, {'name': 'l1'}]})
+    assert type(b._em_data_) is type(b.a._em_data_) is type(b.l[1]._em_data_)
+    assert b.dumps() == '{"a":{"name":"a"},"l":[{"name":"l0"},{"name":"l1"}]}'
+    assert b._em_data_.cache
+    b.l[1].name = 'L1'
+    assert not b._em_data_.cache
+    assert b.dumps() == '{"a":{"name":"a"},"l":[{"name":"l0"},{"name":"L1"}]}'
+    b.a.age = 5
+    assert b.dumps() == '{"a":{"name":"a","age":5},"l":[{"name":"l0"},{"name":"L1"}]}'
+
+    # 제자리에서 고칠 수 있는 값이나 cache 를 쓰지 않는 Entity 를 포함하면 캐시하지 않는다.
+    b.j = {'k': 1}
+    assert b.dumps() == '{"a":{"name":"a","age":5},"l":[{"name":"l0"},{"name":"L1"}],"j":{"k":1}}'
+    assert b._em_data_.cache is False and b.a._em_data_.cache
+    b.j['k'] = 2
+    assert b.dumps() == '{"a":{"name":"a","age":5},"l":[{"name":"l0"},{"name":"L1"}],"j":{"k":2}}'
+    del b.j
+    b.c = C({'name': 'c'})
+    assert b.dumps() == '{"a":{"name":"a","age":5},"l":[{"name":"l0"},{"name":"L1"}],"c":{"name":"c"}}'
+    assert b._em_data_.cache is False
+    b.c.name = 'd'
+    assert b.dumps() == '{"a":{"name":"a","age":5},"l":[{"name":"l0"},{"name":"L1"}],"c":{"name":"d"}}'
+
+    # Context-local 코덱을 쓰면 캐시하지 않는다.
+    a = A({'name': 'x'})
+    ctx = meta.Context()
+    ctx.set_codec('json', meta.Context.get_global_codec('json'))
+    a.dumps(ctx)
+    assert not a._em_data_.cache
+
+    f, args = b.__reduce__()
+    y = f(*args)
+    assert type(y._em_data_) is type(b._em_data_) and y == b
+    assert y.dumps() == b.dumps()
+
+
+def test_shared_options():
+    class A(meta.Entity):
+        kind = meta.Kind('A')
+        name = meta.Unicode()
+
+    class B(A):
+        kind = 'B'
+
+    class C(A):
+        kind = 'C'
+
+    class X(meta.Entity):
+        a = A(only=['name'])
+        authors = A[:](required=True)
+
+    x = X().load({'a': {'kind': 'B', 'name': 'a'}, 'authors': [{'kind': 'C'}, {'kind': 'B'}]})
+    assert type(x.a) is B
+    assert x.a.get_options() is X.a.get_options()
+    assert x.authors[0].get_options() is x.authors[1].get_options()
+    assert x.authors[0].get_options().required
+
+    # copy on write
+    x.a.apply_options(only=['kind'])
+    assert x.a.get_options().only == frozenset(['kind'])
+    assert X.a.get_options().only == frozenset(['name'])
+    assert x.a.dump() == {'kind': 'B'}
+
+
+def test_batch():
+    class Book(meta.Entity):
+        title = meta.Unicode(required=True)
+        price = meta.Float()
+        pages = meta.Integer(default=100)
+        sold = meta.Boolean()
+
+    class Shelf(meta.Entity):
+        books = meta.Tuple(Book(), repeat=Ellipsis, batch=True)
+
+    class Plain(meta.Entity):
+        books = Book[:]()
+
+    data = {'books': [{'title': 't%d' % i, 'price': i * 1.5, 'pages': i, 'sold': i % 2 == 0} for i in range(4)]}
+    shelf = Shelf().load(data)
+    books = shelf.books
+    assert isinstance(books, meta.EntityBatch)
+    assert len(books) == 4
+    assert isinstance(books.column('price'), array.array)
+    assert isinstance(books.column('pages'), array.array)
+    assert list(books.column('sold')) == [True, False, True, False]
+    assert books[0].sold is True and books[1:3].column('sold')[0] is False
+    assert shelf.dump() == Plain().load(data).dump() == data
+    assert Shelf().load(data, meta.Context(optimistic=False)).books == books
+
+    book = books[-1]
+    assert isinstance(book, Book)
+    assert book.title == 't3' and book.price == 4.5 and book.sold is False
+    assert dict(book) == Plain().load(data).books[-1]
+    assert type(book.copy()) is Book
+    assert book.copy() == book
+
+    # rows are views
+    books[0].price = None
+    assert books.column('price') == [None, 1.5, 3.0, 4.5]
+    assert 'price' not in books[0]
+    del books[0]['pages']
+    assert books[0].pages == 100
+    books[1].pages = 2 ** 70
+    assert books[1].pages == 2 ** 70
+
+    assert books[1:3] == meta.EntityBatch(Book, [books[1], books[2]])
+    assert [b.title for b in books[1:3]] == ['t1', 't2']
+
+    # assignment
+    x = Shelf()
+    x.books = books
+    assert x.books is books
+    x.books = [Book({'title': 'a'})]
+    assert isinstance(x.books, meta.EntityBatch)
+
+    class Y(meta.Entity):
+        book = Book()
+
+    y = Y()
+    y.book = books[2]
+    assert y.dump() == {'book': data['books'][2]}
+
+    with pytest.raises(ValueError):
+        books.append({'title': 'a'})
+
+    ctx = meta.Context(max_errors=5)
+    with pytest.raises(ValueError):
+        Shelf().load({'books': [{'title': 1}, {'title': 'a', 'price': 'x'}]}, ctx)
+    assert [e.location for e in ctx.errors] == ['/books/0/title', '/books/1/price']
+
+    class Bad(meta.Entity):
+        numbers = meta.Tuple(meta.Integer(), repeat=Ellipsis, batch=True)
+
+    with pytest.raises(TypeError):
+        Bad().load({'numbers': [1]})
+
+
+def test_batch_kind():
+    class A(meta.Entity):
+        kind = meta.Kind('A')
+        name = meta.Unicode()
+        flag = meta.Boolean()
+
+    class B(A):
+        kind = 'B'
+
+    class X(meta.Entity):
+        a = A()
+        b = meta.Tuple(B(), repeat=Ellipsis, batch=True)
+
+    data = {'kind': 'B', 'name': 'x', 'flag': True}
+    batch = meta.EntityBatch(B, [B().load(data)])
+    assert batch[0].dump() == B().load(data).dump() == data
+    assert A().load(batch[0].dump()).kind == 'B'
+    assert A._cs_kind_ns_['B'] is B
+
+    x = X()
+    x.a = batch[0]
+    assert x.dump() == {'a': data}
+    assert x.dumps() == X().load({'a': data}).dumps()
+    assert X().load(x.dump()) == x
+    for ctx in (meta.Context(), meta.Context(optimistic=False)):
+        y = X().load({'b': [data, data]}, ctx)
+        assert y.dump() == {'b': [data, data]}
+        assert X().load(y.dump()).b == y.b
+
+
+class PickleA(meta.Entity):
+    kind = meta.Kind('A')
+    name = meta.Unicode(required=True)
+
+
+class PickleB(PickleA):
+    kind = 'B'
+    n = meta.Integer()
+
+
+class PickleS(meta.Entity):
+    class Meta:
+        slots = True
+
+    x = meta.Float()
+    y = meta.Integer()
+
+
+class PickleU(meta.Union):
+    i = meta.Integer(ordered=True)
+    s = meta.Unicode(ordered=True)
+
+
+@meta.declare
+class PickleX: pass
+
+
+class PickleX(meta.Entity):
+    a = PickleA[:]()
+    u = PickleU()
+    s = meta.Tuple(PickleS(), repeat=Ellipsis, batch=True)
+    l = meta.Integer[:](lazy=True)
+    x = PickleX()
+    none = meta.Integer()
+
+
+def test_pickle():
+    import pickle
+
+    x = PickleX().load({'a': [{'kind': 'B', 'name': 'a', 'n': 1}], 'u': 's', 's': [{'x': 1.5, 'y': 2}, {'x': 2.5}],
+                        'l': [1, 2], 'x': {'u': 1}})
+    x.none = meta.Null
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        y = pickle.loads(pickle.dumps(x, protocol))
+        assert y == x
+        assert y.dump() == x.dump()
+        assert type(y.a[0]) is PickleB
+        assert y.none is meta.Null
+        assert y.u.get_item() == ('s', 's')
+        assert isinstance(y.s, meta.EntityBatch) and list(y.s.column('x')) == [1.5, 2.5]
+        assert y.l == (1, 2)
+
+    row = pickle.loads(pickle.dumps(x.s[0]))
+    assert type(row) is PickleS and row == PickleS({'x': 1.5, 'y': 2})
+
+    a = PickleA(required=True)
+    b = pickle.loads(pickle.dumps(a))
+    assert b.get_options().required and b == a
+    assert pickle.loads(pickle.dumps(PickleX.x)).__class__ is PickleX
+    assert pickle.loads(pickle.dumps(PickleX.a)).get_components()[0].__class__ is PickleA
+
+
+def test_threads():
+    import sys
+
+    @meta.declare
+    class T: pass
+
+    class T(meta.Entity):
+        name = meta.Unicode()
+        children = T[:]()
+
+    context = meta.Context(strict=True, max_errors=2, shared=True)
+
+    def work(i):
+        child = {'name': 'c'}
+        if i % 2:
+            child['x%d' % i] = i
+        try:
+            return T().load({'name': 'p', 'children': [child]}, context).dumps(context)
+        except ValueError:
+            errors = [e.location for e in context.errors]
+            context.reset()
+            return errors
+
+    interval = sys.getswitchinterval() if PY3 else None
+    if PY3:
+        sys.setswitchinterval(1e-6)
+    try:
+        with futures.ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(work, range(200)))
+    finally:
+        if PY3:
+            sys.setswitchinterval(interval)
+    for i, result in enumerate(results):
+        if i % 2:
+            assert result == ['/children/0/x%d' % i]
+        else:
+            assert json.loads(result) == {'name': 'p', 'children': [{'name': 'c'}]}
+    assert context.errors is None
+    assert '_es_loader_' in T.__dict__
+
+
+def test_aload(monkeypatch):
+    asyncio = pytest.importorskip('asyncio')
+    from flowdas.meta.property import _Cooperative
+
+    monkeypatch.setattr(_Cooperative, '_split', 2)
+
+    class Item(meta.Entity):
+        name = meta.Unicode(codec='json')
+        tags = meta.Unicode[:]()
+
+    class Doc(meta.Entity):
+        items = Item[:]()
+        title = meta.Unicode()
+
+    data = {'title': 't', 'items': [{'name': '"x%d"' % i, 'tags': ['a', 'b', 'c']} for i in range(50)]}
+
+    def run(awaitable):
+        # budget 이 0 이면 값 하나를 처리할 때마다 양보한다.
+        steps = 0
+        iterator = awaitable.__await__()
+        while True:
+            try:
+                iterator.send(None)
+            except StopIteration as e:
+                return e.args[0] if e.args else None, steps
+            steps += 1
+
+    context = meta.Context()
+    doc, steps = run(Doc().aload(data, context, budget_ms=0))
+    assert doc == Doc().load(data, context) and steps > 50
+    assert run(doc.adump(context, budget_ms=0))[0] == doc.dump(context)
+    assert run(Doc.items.adump(doc.items, budget_ms=0))[0] == Doc.items.dump(doc.items)
+
+    data['items'][7]['tags'] = ['a', 1, 'c']
+    data['items'][9]['tags'] = 5
+    for options in ({}, {'max_errors': 2}, {'optimistic': False}):
+        expected = meta.Context(**options)
+        with pytest.raises(ValueError):
+            Doc().load(data, expected)
+        context = meta.Context(**options)
+        with pytest.raises(ValueError):
+            run(Doc().aload(data, context, budget_ms=0))
+        assert repr(context.errors) == repr(expected.errors)
+    with pytest.raises(ValueError):
+        run(Doc().aload(data))
+
+    async_load = Doc().aload(data, budget_ms=0)
+    async_load.send(None)
+    with pytest.raises(KeyboardInterrupt):
+        async_load.throw(KeyboardInterrupt)
+    assert not async_load._stack
+
+    loop = asyncio.new_event_loop()
+    try:
+        del data['items'][7:]
+        assert loop.run_until_complete(Doc().aload(data)) == Doc().load(data)
+    finally:
+        loop.close()
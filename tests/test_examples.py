@@ -32,6 +32,8 @@ def test_rst(name):
         return
     if name == 'codec' and PY2:
         return
+    if name == 'aload_iter' and PY2:
+        return
     assert failure_count == 0
 
 GUIDE = os.path.join(os.path.dirname(__file__), '../docs')
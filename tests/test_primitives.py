@@ -514,6 +514,36 @@ def test_datetime():
     assert kst_aware == X.p.load(kst_iso8601, context)
 
 
+def test_iso8601_parse_many():
+    class X(meta.Entity):
+        p = meta.DateTime[:]()
+        t = meta.Time[:]()
+        d = meta.Date[:]()
+
+    values = ['2016-03-06T15:04:24Z', '2016-03-06 15:04:24.5+09:00', '2016-03-06T15:04:24-00:00', '2016-03-06',
+              ' 2016-03-06T15:04:24.038691+05:30 ', '2016-03-06T15:04+09:00', '2016-03-06T15:04:24+09:00junk']
+    formatter = meta.DateTimeFormat.get_formatter('iso')
+    for P in (meta.DateTime, meta.Time, meta.Date):
+        expected = [formatter.parse(v, P, None) for v in values]
+        assert formatter.parse_many(values, P, None) == expected
+        assert [getattr(v, 'utcoffset', lambda: None)() for v in formatter.parse_many(values, P, None)] == [
+            getattr(v, 'utcoffset', lambda: None)() for v in expected]
+
+    x = X().load({'p': values, 't': values + ['15:04:24Z'], 'd': values})
+    assert x.p[0] == datetime.datetime(2016, 3, 6, 15, 4, 24, tzinfo=timezone.utc)
+    assert x.p[0].tzinfo is x.p[2].tzinfo is timezone.utc
+    assert x.p[1].tzinfo is x.p[6].tzinfo
+    assert x.p[1].microsecond == 500000 and x.p[3] == datetime.datetime(2016, 3, 6)
+    assert x.t[-1] == datetime.time(15, 4, 24, tzinfo=timezone.utc)
+    assert x.d == (datetime.date(2016, 3, 6),) * len(values)
+    assert X().load(x.dump()) == x
+
+    ctx = meta.Context()
+    with pytest.raises(ValueError):
+        X().load({'p': ['2016-03-06T15:04:24Z', '2016-02-30T15:04:24Z']}, ctx)
+    assert ctx.errors[0].location == '/p/1'
+
+
 def test_time():
     class X(meta.Entity):
         p = meta.Time(format='unix')
@@ -668,6 +698,33 @@ def test_date():
     assert kst_date == X.p.load(kst_iso8601, context)
 
 
+def test_strftime_format():
+    formats = ['%Y/%m/%d %H:%M:%S.%f', '%y%m%d', 'T%H:%M', '%d.%m.%Y (%%)', '%Y-%m-%dT%H:%M:%S%z', '%b %d %Y']
+    values = ['2016/03/06 15:04:24.5', '2016/03/06 15:04:24.038691', '2016/3/6  15:4:24.0', '160306', '690306',
+              't15:04', 'T25:04', '06.03.2016 (%)', '06.03.2016 %', '2016-03-06T15:04:24+0900', 'Mar 06 2016',
+              '2016/02/30 15:04:24.5', '']
+    for format in formats:
+        for value in values:
+            try:
+                expected = datetime.datetime.strptime(value, format)
+            except ValueError as e:
+                with pytest.raises(ValueError) as excinfo:
+                    meta.DateTime(format=format).load(value)
+                assert str(excinfo.value) == str(e)
+                continue
+            assert meta.DateTime(format=format).load(value) == expected
+            assert meta.Date(format=format).load(value) == expected.date()
+            assert meta.Time(format=format).load(value) == expected.time()
+
+    d = datetime.datetime(2016, 3, 6, 15, 4, 24, 38691)
+    for value in (d, d.replace(year=5), d.date(), d.time()):
+        P = {datetime.date: meta.Date, datetime.time: meta.Time}.get(type(value), meta.DateTime)
+        for format in formats:
+            if isinstance(value, datetime.time) and format != 'T%H:%M':
+                continue
+            assert P(format=format).dump(value) == value.strftime(format)
+
+
 def test_rfc822format():
     utc_naive = datetime.datetime(2016, 3, 6, 15, 4, 24)
     kst_naive = datetime.datetime(2016, 3, 7, 0, 4, 24)
@@ -770,6 +827,34 @@ def test_rfc822format():
     assert x.dump()['z'] == 'Thu, 01 Jan 1970 15:04:24 GMT'
 
 
+def test_rfc822format_cache(monkeypatch):
+    kst = timezone(datetime.timedelta(hours=9))
+    d = datetime.datetime(2016, 3, 7, 0, 4, 24, 1234, tzinfo=kst)
+    for name in ('email', 'http'):
+        formatter = meta.DateTimeFormat.get_formatter(name)
+        monkeypatch.setattr(formatter, 'CACHE_SIZE', 4)
+        monkeypatch.setattr(formatter, '_formatted', {})
+        monkeypatch.setattr(formatter, '_parsed', {})
+        x = meta.DateTime(format=name)
+        for value in (d, d.replace(microsecond=0), d.astimezone(timezone.utc), d.replace(tzinfo=None)):
+            expected = x.dump(value.replace(microsecond=999999))
+            assert x.dump(value) == expected
+            assert len(formatter._formatted) <= 4
+        assert meta.Date(format=name).dump(d.date()) == meta.DateTime(format=name).dump(d.replace(
+            hour=0, minute=0, second=0, microsecond=0, tzinfo=None))
+        assert meta.Time(format=name).dump(d.timetz()) != meta.Time(format=name).dump(d.time())
+
+        s = 'Mon, 07 Mar 2016 00:04:24 +0900'
+        assert x.load(s) == d.replace(microsecond=0)
+        assert meta.Date(format=name).load(s) == d.date()
+        assert meta.Time(format=name).load(s) == d.timetz().replace(microsecond=0)
+        for i in range(10):
+            x.load('Mon, 07 Mar 2016 00:04:%02d GMT' % i)
+        assert len(formatter._parsed) <= 4
+        with pytest.raises(ValueError):
+            x.load('garbage')
+
+
 def test_duration():
     class X(meta.Entity):
         t = meta.Duration()
@@ -287,6 +287,75 @@ def test_tuplization():
     check_tuple35678(X)
 
 
+def test_lazy_tuple():
+    calls = []
+
+    class P(meta.Integer):
+        def _load_(self, value, context):
+            calls.append(value)
+            return super(P, self)._load_(value, context)
+
+    class A(meta.Entity):
+        name = meta.Unicode(required=True)
+
+    class X(meta.Entity):
+        p = P[:](lazy=True)
+        a = A[1:](lazy=True)
+        t = meta.Tuple(P(default=7), meta.String(view='secret'), repeat=Ellipsis, lazy=True)
+
+    assert X.p._pm_opts_.lazy and not hasattr(X.p.get_components()[0]._pm_opts_, 'lazy')
+
+    x = X().load({'p': list(range(100)), 'a': [{'name': 'a'}, {'name': 1}]}, meta.Context())
+    assert calls == []
+    assert len(x.p) == 100
+    assert x.p[50] == 50 and x.p[-1] == 99
+    assert x.p[50] == 50
+    assert calls == [50, 99]
+    assert x.p[1:4] == (1, 2, 3)
+    assert calls == [50, 99, 1, 2, 3]
+    with pytest.raises(IndexError):
+        x.p[100]
+    assert list(x.p) == list(range(100))
+    assert x.p == tuple(range(100)) and tuple(range(100)) == x.p
+    assert x.a[0] == A({'name': 'a'})
+    with pytest.raises(ValueError) as e:
+        x.a[1]
+    assert str(e.value) == '/1/name'
+    with pytest.raises(ValueError):
+        x.dump()
+
+    x.p = x.p
+    assert isinstance(x.p, Sequence) and not isinstance(x.p, tuple)
+    x.p = (1, 2)
+    assert x.p == (1, 2)
+    del x.a
+    assert x.dump() == {'p': [1, 2]}
+
+    with pytest.raises(ValueError):
+        X().load({'a': []})
+    with pytest.raises(ValueError):
+        X().load({'p': 1})
+    assert X().load({'p': []}).p == ()
+
+    value = [1, 2, 3]
+    x = X().load({'p': value})
+    value[1] = 'x'
+    del value[2]
+    assert x.p == (1, 2, 3)
+    value = tuple(range(1000))
+    assert X().load({'p': value}).p._value is value
+
+    ctx = meta.Context(view='nobody')
+    x = X().load({'t': [None, None, 1, 'secret']}, ctx)
+    assert x.t[:2] == (7, None)
+    with pytest.raises(ValueError) as e:
+        x.t[3]
+    assert str(e.value) == '/3'
+
+    with pytest.raises(TypeError):
+        meta.Tuple(A(), lazy=True, batch=True)
+
+
 def test_marker():
     context = meta.Context()
     value = {
@@ -531,3 +600,251 @@ def test_context():
     with pytest.raises(ValueError):
         x = meta.Entity().load({'x': 1}, ctx)
     assert repr(ctx) == 'Context(errors=[ValueError(/x?)], strict=True)'
+
+
+def test_optimistic():
+    calls = []
+
+    class P(meta.Integer):
+        def _load_(self, value, context):
+            calls.append(value)
+            return super(P, self)._load_(value, context)
+
+    class X(meta.Entity):
+        a = P[:]()
+        t = meta.Tuple(P(), meta.String(), repeat=Ellipsis)
+        j = meta.JsonObject()
+
+    value = {'a': [1, 2, 3], 't': [4, 'x', 5, 'y'], 'j': {'k': [1, {'l': None}]}}
+    assert X().load(value, meta.Context(optimistic=False)).dump() == value
+    tracked = calls[:]
+
+    del calls[:]
+    assert X().load(value, meta.Context()).dump() == value
+    assert calls == tracked
+
+    for value in ({'a': [1, 'x', 3, 'y']}, {'t': [4, 'x', 'z', 'y']}, {'j': {'k': [1, {'l': set()}], 2: 3}}):
+        errors = []
+        for optimistic in (True, False):
+            for max_errors in (1, 5):
+                ctx = meta.Context(optimistic=optimistic, max_errors=max_errors)
+                with pytest.raises(ValueError):
+                    X().load(value, ctx)
+                errors.append([(e.location, e.value) for e in ctx.errors])
+        assert errors[0] == errors[2]
+        assert errors[1] == errors[3]
+
+    del calls[:]
+    ctx = meta.Context()
+    with pytest.raises(ValueError):
+        X().load({'a': [1, 'x']}, ctx)
+    assert calls == [1, 'x', 1, 'x']
+    assert [e.location for e in ctx.errors] == ['/a/1']
+
+    del calls[:]
+    ctx = meta.Context(optimistic=False)
+    with pytest.raises(ValueError):
+        X().load({'a': [1, 'x']}, ctx)
+    assert calls == [1, 'x']
+    assert [e.location for e in ctx.errors] == ['/a/1']
+
+
+def test_optimistic_side_effects():
+    calls = []
+
+    def validate(value):
+        calls.append(value)
+        return value >= 0
+
+    class X(meta.Entity):
+        a = meta.Integer[:](validate=validate)
+
+    # 올바른 입력은 한 번만 검사한다.
+    X().load({'a': [1, 2]}, meta.Context())
+    assert calls == [1, 2]
+
+    # 에러가 있으면 에러가 발생한 지점까지 추적하며 다시 실행한다.
+    del calls[:]
+    with pytest.raises(ValueError):
+        X().load({'a': [1, -2, 3]}, meta.Context())
+    assert calls == [1, -2, 1, -2]
+
+    del calls[:]
+    with pytest.raises(ValueError):
+        X().load({'a': [1, -2, 3]})
+    assert calls == [1, -2, 1, -2]
+
+    del calls[:]
+    with pytest.raises(ValueError):
+        X().load({'a': [1, -2, 3]}, meta.Context(optimistic=False))
+    assert calls == [1, -2]
+
+def test_setter_without_context(monkeypatch):
+    class X(meta.Entity):
+        i = meta.Integer()
+        t = meta.Integer[:]()
+        j = meta.JsonObject()
+
+    contexts = []
+    init = meta.Context.__init__
+
+    def counting_init(self, **kwargs):
+        contexts.append(self)
+        init(self, **kwargs)
+
+    x = X()
+    x.i = 0  # the implicit context is created once per thread
+    monkeypatch.setattr(meta.Context, '__init__', counting_init)
+
+    x.i = 1
+    x['t'] = [1, 2]
+    x.update(j={'a': [1, {'b': None}]})
+    assert X(x.dump()) == x
+    assert contexts == []
+
+    with pytest.raises(ValueError):
+        x.t = [1, 'x']
+    assert len(contexts) == 1
+    assert x.t == (1, 2)
+
+    with pytest.raises(ValueError):
+        x.j = {'a': [set()]}
+    x.i = 2
+    assert x.dump() == {'i': 2, 't': [1, 2], 'j': {'a': [1, {'b': None}]}}
+
+
+class ManyAuthor(meta.Entity):
+    name = meta.Unicode(required=True)
+    age = meta.Integer(view='private')
+
+
+class ManyCodec(meta.Codec):
+    def encode(self, value, property, context):
+        return -value
+
+    def decode(self, value, property, context):
+        if value == 13:
+            raise RuntimeError('unlucky')
+        return -value
+
+
+class ManyScore(meta.Entity):
+    score = meta.Integer(codec='many')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_many(workers):
+    values = [{'name': u'a%d' % i, 'age': i} for i in range(50)]
+    authors = ManyAuthor().load_many(values, workers=workers, chunksize=7)
+    assert authors == [ManyAuthor(value) for value in values]
+    assert ManyAuthor().dump_many(authors, workers=workers, chunksize=7) == values
+    assert ManyAuthor.age.load_many([1, None], workers=workers, chunksize=1) == [1, None]
+    assert ManyAuthor().load_many(iter([]), workers=workers) == []
+
+    ctx = meta.Context(view='public')
+    assert ManyAuthor().dump_many(authors[:10], ctx, workers=workers, chunksize=3) == [{'name': u'a%d' % i} for i in
+                                                                                       range(10)]
+    assert ctx.errors is None
+
+    values[3] = {'name': u'x', 'age': 'x'}
+    values[11] = {'name': None}
+    values[30] = 1
+    with pytest.raises(ValueError) as e:
+        ManyAuthor().load_many(values, workers=workers, chunksize=7)
+    assert str(e.value) == '/3/age'
+
+    ctx = meta.Context(max_errors=2)
+    authors = ManyAuthor().load_many(values, ctx, workers=workers, chunksize=7)
+    assert [(e.location, e.value) for e in ctx.errors] == [('/3/age', 'x'), ('/11/name', None)]
+    assert ctx.errors[0].exc_info[0] is ValueError
+    assert [i for i, author in enumerate(authors) if author is None] == [3, 11, 30]
+    assert authors[4] == ManyAuthor(values[4])
+
+    ctx = meta.Context(max_errors=5, strict=True)
+    values[40] = {'name': u'y', 'extra': 1}
+    authors = ManyAuthor().load_many(values, ctx, workers=workers, chunksize=7)
+    assert [(e.location, e.value) for e in ctx.errors] == [('/3/age', 'x'), ('/11/name', None), ('/30', 1),
+                                                           ('/40/extra', meta.Null)]
+    assert authors[39] == ManyAuthor(values[39]) and authors[40] is None
+
+    ctx = meta.Context(max_errors=5, shared=True)
+    ctx.set_codec('many', ManyCodec())
+    scores = ManyScore().load_many([{'score': i} for i in range(20)], ctx, workers=workers, chunksize=3)
+    assert [score and score.score for score in scores] == [-i if i != 13 else None for i in range(20)]
+    assert [e.location for e in ctx.errors] == ['/13/score']
+    assert ctx.errors[0].exc_info[0] is RuntimeError
+    assert ManyScore().dump_many(scores[:3], ctx, workers=workers, chunksize=1) == [{'score': i} for i in range(3)]
+    ctx = meta.Context()
+    assert ManyScore().load_many([{'score': 1}], ctx, workers=workers) == [None]
+    assert ctx.errors[0].exc_info[0] is LookupError
+
+
+def test_many_without_futures(monkeypatch):
+    from flowdas.meta import compat, property as module
+
+    monkeypatch.setattr(module, 'futures', compat._lazy_module('concurrent.no_such_module'))
+    values = [{'name': u'a%d' % i} for i in range(10)]
+    assert ManyAuthor().load_many(values, workers=4, chunksize=3) == [ManyAuthor(value) for value in values]
+
+
+def test_shared_context():
+    import threading
+
+    context = meta.Context(strict=True, shared=True)
+    assert repr(context) == 'Context(shared=True, strict=True)'
+
+    class A(meta.Entity):
+        a = meta.Integer()
+
+    with pytest.raises(ValueError):
+        A().load({'b': 1}, context)
+    assert [e.location for e in context.errors] == ['/b']
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append((context.errors, A().load({'a': 1}, context).a)))
+    thread.start()
+    thread.join()
+    assert other == [(None, 1)]
+    assert [e.location for e in context.errors] == ['/b']
+    context.reset()
+    assert context.errors is None
+    assert A().load({'a': 2}, context).dump(context) == {'a': 2}
+
+
+def test_shared_context_codec():
+    import threading
+
+    class Negate(meta.Codec):
+        def encode(self, value, property, context):
+            return -value
+
+        def decode(self, value, property, context):
+            return -value
+
+    class X(meta.Entity):
+        a = meta.Integer(codec='negate')
+
+    context = meta.Context(shared=True)
+    started, registered = threading.Event(), threading.Event()
+    results = []
+
+    def run():
+        context.reset()  # 이 스레드의 인스턴스를 코덱을 등록하기 전에 만든다.
+        started.set()
+        registered.wait()
+        results.append(X().load({'a': 1}, context).a)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    started.wait()
+    context.set_codec('negate', Negate())
+    registered.set()
+    thread.join()
+    assert results == [-1]
+    assert X({'a': 2}).dump(context) == {'a': -2}
+
+    copied = context.copy()
+    copied.set_codec('other', Negate())
+    with pytest.raises(LookupError):
+        context.get_codec('other')
+    assert copied.get_codec('negate') is context.get_codec('negate')
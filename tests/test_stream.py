@@ -0,0 +1,246 @@
+# coding=utf-8
+from __future__ import print_function
+
+import io
+import json
+
+import pytest
+from flowdas import meta
+from flowdas.meta.compat import *
+
+
+class Book(meta.Entity):
+    title = meta.Unicode(required=True)
+    price = meta.Float()
+
+
+ROWS = [{'title': u't%d 가' % i, 'price': i * 1.5} for i in range(100)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64, 65536])
+def test_load_iter(chunk_size):
+    text = json.dumps(ROWS)
+    for fp in (io.StringIO(unicode_type(text)), io.BytesIO(text.encode('utf-8'))):
+        books = list(meta.load_iter(fp, Book(), chunk_size=chunk_size))
+        assert all(isinstance(book, Book) for book in books)
+        assert [book.dump() for book in books] == ROWS
+
+    doc = json.dumps({'meta': {'a': [1, {'b': 2}]}, 'x/y': {'books': ROWS}, 'tail': 1})
+    books = meta.load_iter(io.BytesIO(doc.encode('utf-8')), Book(), path='/x~1y/books', chunk_size=chunk_size)
+    assert [book.dump() for book in books] == ROWS
+
+    numbers = meta.load_iter(io.StringIO(u' [1, 22 ,333] '), meta.Integer(), chunk_size=chunk_size)
+    assert list(numbers) == [1, 22, 333]
+    assert list(meta.load_iter(io.StringIO(u'[ ]'), meta.Integer(), chunk_size=chunk_size)) == []
+
+
+def test_load_iter_numbers():
+    text = u'[10.5, 2.25, 3e5, -7, 1.5E-3, 12345678901234567890, -0.125e+2, 0, true, 7.0]'
+    expected = json.loads(text)
+    for chunk_size in range(1, 8):
+        for fp in (io.StringIO(text), io.BytesIO(text.encode('utf-8'))):
+            assert list(meta.load_iter(fp, meta.Primitive(), chunk_size=chunk_size)) == expected
+        numbers = meta.load_iter(io.StringIO(u'{"a":' + text[:-1] + u']}'), meta.Primitive(), path='/a',
+                                 chunk_size=chunk_size)
+        assert list(numbers) == expected
+
+
+def test_load_iter_malformed():
+    class Counting(io.BytesIO):
+        nbytes = 0
+
+        def read(self, size=-1):
+            chunk = super(Counting, self).read(size)
+            self.nbytes += len(chunk)
+            return chunk
+
+    tail = (u', {"title": "%s"}' % (u'x' * 1000)) * 1000
+    for head, location in [(u'[{"title": x}', '/0'), (u'[{"title": "a"}, [1,, 2]', '/1'), (u'[tx', '/0'),
+                           (u'[{"title": "a\tb"}', '/0')]:
+        fp = Counting((head + tail + u']').encode('utf-8'))
+        with pytest.raises(ValueError) as e:
+            list(meta.load_iter(fp, meta.JsonObject(), chunk_size=64))
+        assert str(e.value).startswith(location + ': ')
+        assert fp.nbytes <= 256
+
+    text = u'[{"title": "%s", "n": -Infinity, "u": "\\ud83d\\ude00"}]' % (u'y' * 1000)
+    for chunk_size in (1, 7, 64):
+        values = list(meta.load_iter(io.StringIO(text), meta.JsonObject(), chunk_size=chunk_size))
+        assert values == json.loads(text)
+
+
+def test_load_iter_errors():
+    ctx = meta.Context()
+    books = meta.load_iter(io.StringIO(u'[{"title": "a"}, {"title": 3}, {"title": "c"}]'), Book(), ctx)
+    assert next(books).title == 'a'
+    with pytest.raises(ValueError):
+        next(books)
+    assert [e.location for e in ctx.errors] == ['/1/title']
+
+    for text, path in [(u'[1, 2', None), (u'[1 2]', None), (u'{"a": 1}', '/a'), (u'{"a": [1]}', '/b'),
+                       (u'[1, }', None)]:
+        with pytest.raises(ValueError):
+            list(meta.load_iter(io.StringIO(text), meta.Integer(), path=path))
+
+
+class Author(meta.Entity):
+    name = meta.Unicode(required=True)
+
+
+class Paper(meta.Entity):
+    title = meta.Unicode()
+    authors = Author[:]()
+
+
+def test_lines():
+    papers = [Paper({'title': u'가%d' % i, 'authors': [Author({'name': 'a'})]}) for i in range(3)]
+    for fp in (io.StringIO(), io.BytesIO()):
+        assert meta.dump_lines(iter(papers), fp) == 3
+        fp.seek(0)
+        assert list(meta.load_lines(fp, Paper)) == papers
+        fp.seek(0)
+        assert list(meta.load_lines(fp, Paper())) == papers
+    assert meta.dump_lines([], io.StringIO()) == 0
+
+
+def test_lines_errors():
+    ctx = meta.Context()
+    fp = io.StringIO(u'{"title": "a"}\n\n{"title": "b", "authors": [{"name": 3}]}\n')
+    with pytest.raises(ValueError) as e:
+        list(meta.load_lines(fp, Paper, ctx))
+    assert str(e.value) == 'line 3: /authors/0/name'
+    assert [e.location for e in ctx.errors] == ['/authors/0/name']
+
+    with pytest.raises(ValueError) as e:
+        list(meta.load_lines(io.StringIO(u'{"title": "a"}\n{bad\n'), Paper))
+    assert str(e.value).startswith('line 2: ')
+
+    class Odd(meta.Integer):
+        def _dump_(self, value, context):
+            if value % 2:
+                raise ValueError()
+            return value
+
+    class X(meta.Entity):
+        odd = Odd()
+
+    with pytest.raises(ValueError) as e:
+        meta.dump_lines([X({'odd': 0}), X({'odd': 1})], io.StringIO())
+    assert str(e.value) == 'line 2: /odd'
+
+
+def test_entity_file(tmpdir, monkeypatch):
+    path = str(tmpdir.join('books.jsonl'))
+    with io.open(path, 'w', encoding='utf-8') as fp:
+        fp.write(u'\n')
+        meta.dump_lines((Book(row) for row in ROWS[:50]), fp)
+        fp.write(u'  \n    \n\t \r\n')
+        meta.dump_lines((Book(row) for row in ROWS[50:]), fp)
+        fp.write(u'{"title": "no newline"}')
+
+    with meta.EntityFile(path, Book) as store:
+        assert len(store) == 101
+        assert store[0].dump() == ROWS[0]
+        assert store[-1] == Book({'title': u'no newline'})
+        assert [book.dump() for book in store[48:52]] == ROWS[48:52]
+        assert [book.dump() for book in store][:100] == ROWS
+        with pytest.raises(IndexError):
+            store[101]
+    assert tmpdir.join('books.jsonl.idx').check()
+
+    def scan(self):
+        raise AssertionError()
+
+    monkeypatch.setattr(meta.EntityFile, '_build_index', scan)
+    with meta.EntityFile(path, Book()) as store:
+        assert store[50].dump() == ROWS[50]
+    monkeypatch.undo()
+
+    with io.open(path, 'a', encoding='utf-8') as fp:
+        fp.write(u'\n{"title": 1}\n')
+    ctx = meta.Context()
+    with meta.EntityFile(path, Book, ctx) as store:
+        assert len(store) == 102
+        with pytest.raises(ValueError) as e:
+            store[101]
+        assert str(e.value) == 'record 102: /title'
+        assert [e.location for e in ctx.errors] == ['/title']
+
+    index_path = str(tmpdir.join('other.idx'))
+    empty = str(tmpdir.join('empty.jsonl'))
+    io.open(empty, 'w').close()
+    with meta.EntityFile(empty, Book, index_path=index_path) as store:
+        assert len(store) == 0
+        assert list(store) == []
+    assert tmpdir.join('other.idx').check()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64, 65536])
+def test_aload(chunk_size):
+    asyncio = pytest.importorskip('asyncio')
+    loop = asyncio.new_event_loop()
+
+    class Source(object):
+        # chunk 들이 이벤트 루프가 한 바퀴 돌 때마다 하나씩 도착한다.
+        def __init__(self, data, stream=True):
+            self.chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+            if stream:
+                self.read = self._read
+
+        def _arrive(self):
+            future = loop.create_future()
+            if self.chunks:
+                loop.call_soon(future.set_result, self.chunks.pop(0))
+            elif hasattr(self, 'read'):
+                loop.call_soon(future.set_result, b'')
+            else:
+                loop.call_soon(future.set_exception, StopAsyncIteration())
+            return future
+
+        def _read(self, n):
+            return self._arrive()
+
+        def __aiter__(self):
+            return self
+
+        def __anext__(self):
+            return self._arrive()
+
+    def collect(iterator):
+        results = []
+        while True:
+            try:
+                results.append(loop.run_until_complete(iterator.__anext__()))
+            except StopAsyncIteration:
+                return results
+
+    try:
+        doc = json.dumps({'meta': {'a': [1, {'b': 2}]}, 'x/y': {'books': ROWS}, 'tail': 1}).encode('utf-8')
+        for stream in (True, False):
+            books = collect(meta.aload_iter(Source(doc, stream), Book(), path='/x~1y/books', chunk_size=5))
+            assert [book.dump() for book in books] == ROWS
+        numbers = meta.aload_iter(Source(b' [1, 22 ,333] '), meta.Integer())
+        assert collect(numbers) == [1, 22, 333]
+        assert collect(meta.aload_iter(Source(b'[ ]'), meta.Integer())) == []
+
+        lines = u''.join(json.dumps(row) + u'\n\n' for row in ROWS).encode('utf-8')
+        assert [book.dump() for book in collect(meta.aload_lines(Source(lines), Book))] == ROWS
+        assert [book.dump() for book in collect(meta.aload_lines(Source(lines.strip(), False), Book))] == ROWS
+
+        ctx = meta.Context()
+        books = meta.aload_iter(Source(b'[{"title": "a"}, {"title": 3}, {"title": "c"}]'), Book(), ctx)
+        assert loop.run_until_complete(books.__anext__()).title == 'a'
+        with pytest.raises(ValueError):
+            loop.run_until_complete(books.__anext__())
+        assert [e.location for e in ctx.errors] == ['/1/title']
+
+        with pytest.raises(ValueError) as e:
+            collect(meta.aload_lines(Source(b'{"title": "a"}\n\n{"title": 3}\n'), Book))
+        assert str(e.value) == 'line 3: /title'
+        with pytest.raises(ValueError) as e:
+            collect(meta.aload_lines(Source(b'{"title": "a"}\n{"title"\n'), Book))
+        assert str(e.value).startswith('line 2: ')
+        with pytest.raises(ValueError):
+            collect(meta.aload_iter(Source(b'[1, 2'), meta.Integer()))
+    finally:
+        loop.close()